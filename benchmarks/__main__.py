@@ -0,0 +1,40 @@
+"""Runs all benchmarks and writes the results as JSON.
+
+Usage:
+
+    python -m benchmarks [-o results.json] [-n number]
+
+"""
+import json
+import platform
+import sys
+from argparse import ArgumentParser
+
+from . import attribute, overhead, specialize
+
+
+def main():
+    parser = ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('-o', '--output', help='file to write the results, '
+                        'defaults to the standard output')
+    parser.add_argument('-n', '--number', type=int, default=overhead.NUMBER,
+                        help='calls per measure')
+    args = parser.parse_args()
+    results = {
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'number': args.number,
+        'results': (overhead.run(args.number) + specialize.run(args.number) +
+                    attribute.run(args.number)),
+    }
+    output = open(args.output, 'w') if args.output else sys.stdout
+    try:
+        json.dump(results, output, indent=2, sort_keys=True)
+        output.write('\n')
+    finally:
+        if args.output:
+            output.close()
+
+
+if __name__ == '__main__':
+    main()
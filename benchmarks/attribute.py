@@ -0,0 +1,101 @@
+"""Measures the overhead of reading and writing advised attributes.
+
+Each case advises reads or writes of an attribute stored in the instance
+`__dict__` or in a slot, and measures both, so the not advised access shows
+the cost of the descriptor alone.
+
+Usage:
+
+    python benchmarks/attribute.py
+
+"""
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import json
+from timeit import repeat
+
+from easyaspect import Pointcut
+from easyaspect.advice import _Advice
+
+NUMBER = 100000
+REPEAT = 3
+
+
+def before(cls, joinpoint, obj, *args):
+    pass
+
+
+def create_class(slots):
+    """Creates a new class, so each case advises its own."""
+    if slots:
+        class Dummy(object):
+            __slots__ = ('value',)
+
+            def __init__(self):
+                self.value = 0
+    else:
+        class Dummy(object):
+            value = 0
+
+            def __init__(self):
+                self.value = 0
+
+    return Dummy
+
+
+def advise(cls, access):
+    """Advises the `access` to the attribute of `cls`."""
+    pointcut = Pointcut(cls, target='properties', access=access)
+    pointcut.add_advice(_Advice('before', pointcut, 'properties', before))
+    return cls
+
+
+def get_value(obj):
+    return lambda: obj.value
+
+
+def set_value(obj):
+    def call():
+        obj.value = 1
+    return call
+
+
+OPERATIONS = {'get': get_value, 'set': set_value}
+
+
+def measure(cls, operation, number=NUMBER):
+    """Returns the best time, in microseconds, of an `operation`."""
+    call = OPERATIONS[operation](cls())
+    return min(repeat(call, number=number, repeat=REPEAT)) / number * 1e6
+
+
+def run(number=NUMBER):
+    """Runs all cases and returns a list of results."""
+    results = []
+    for slots in (False, True):
+        for access in ('get', 'set'):
+            cls = advise(create_class(slots), access)
+            for operation in sorted(OPERATIONS):
+                baseline = measure(create_class(slots), operation, number)
+                time = measure(cls, operation, number)
+                results.append({
+                    'suite': 'attribute',
+                    'group': 'advised' if operation == access else (
+                        'not_advised'),
+                    'params': {'slots': slots, 'access': access,
+                               'operation': operation},
+                    'baseline_us': baseline,
+                    'time_us': time,
+                    'overhead_us': time - baseline,
+                })
+    return results
+
+
+def main():
+    print json.dumps(run(), indent=2, sort_keys=True)
+
+
+if __name__ == '__main__':
+    main()
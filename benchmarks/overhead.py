@@ -0,0 +1,156 @@
+"""Measures the overhead of calls to advised functions.
+
+Usage:
+
+    python benchmarks/overhead.py
+
+"""
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import json
+from timeit import repeat
+
+from easyaspect import Pointcut
+from easyaspect.advice import _Advice
+
+NUMBER = 100000
+REPEAT = 3
+SIZES = [1, 4, 16]
+
+
+def before(cls, joinpoint, obj, *args, **kwargs):
+    pass
+
+
+def around(cls, joinpoint, next_, obj, *args, **kwargs):
+    return next_(obj, *args, **kwargs)
+
+
+ADVICES = {'before': before, 'around': around, 'after': before}
+
+
+def create_class(base=object):
+    """Creates a new class, so each case advises its own."""
+    class Dummy(base):
+        value = 0
+
+        def method(self, a):
+            return a
+
+    return Dummy
+
+
+def add_advices(pointcut, type, count=1):
+    """Adds `count` advices of `type` to `pointcut`."""
+    for i in range(count):
+        pointcut.add_advice(_Advice(type, pointcut, 'all', ADVICES[type]))
+
+
+def advices_case(type, count):
+    cls = create_class()
+    pointcut = Pointcut(cls.method)
+    add_advices(pointcut, type, count)
+    return cls
+
+
+def pointcuts_case(count):
+    cls = create_class()
+    for i in range(count):
+        add_advices(Pointcut(cls.method), 'before')
+    return cls
+
+
+def inheritance_case(depth):
+    base = create_class()
+    add_advices(Pointcut(base.method), 'before')
+    cls = base
+    for i in range(depth):
+        cls = create_class(cls)
+        # Remove the method, so it is inherited
+        del cls.method
+    # Advise the inherited method
+    add_advices(Pointcut(cls.method), 'before')
+    return cls
+
+
+def disabled_case(swap):
+    cls = create_class()
+    pointcut = Pointcut(cls.method)
+    add_advices(pointcut, 'before')
+    pointcut.disable(swap=swap)
+    return cls
+
+
+def property_case():
+    cls = create_class()
+    add_advices(Pointcut(cls, target='properties'), 'before')
+    return cls
+
+
+def method_call(cls):
+    obj = cls()
+    method = obj.method
+    return lambda: method(1)
+
+
+def property_set(cls):
+    obj = cls()
+
+    def call():
+        obj.value = 1
+    return call
+
+
+def get_cases():
+    """Returns tuples with the group name, the parameters, a function
+    creating the advised class and the function calling it."""
+    cases = []
+    for type in ('before', 'around', 'after'):
+        for count in SIZES:
+            cases.append(('advices', {'type': type, 'count': count},
+                          lambda type=type, count=count:
+                          advices_case(type, count), method_call))
+    for count in SIZES:
+        cases.append(('pointcuts', {'count': count},
+                      lambda count=count: pointcuts_case(count), method_call))
+    for depth in SIZES:
+        cases.append(('inheritance', {'depth': depth},
+                      lambda depth=depth: inheritance_case(depth),
+                      method_call))
+    cases.append(('property', {}, property_case, property_set))
+    for swap in (False, True):
+        cases.append(('disabled', {'swap': swap},
+                      lambda swap=swap: disabled_case(swap), method_call))
+    return cases
+
+
+def measure(call, number=NUMBER):
+    """Returns the best time, in microseconds, of a call to `call`."""
+    return min(repeat(call, number=number, repeat=REPEAT)) / number * 1e6
+
+
+def run(number=NUMBER):
+    """Runs all cases and returns a list of results."""
+    results = []
+    for group, params, make_class, make_call in get_cases():
+        baseline = measure(make_call(create_class()), number)
+        time = measure(make_call(make_class()), number)
+        results.append({
+            'suite': 'overhead',
+            'group': group,
+            'params': params,
+            'baseline_us': baseline,
+            'time_us': time,
+            'overhead_us': time - baseline,
+        })
+    return results
+
+
+def main():
+    print json.dumps(run(), indent=2, sort_keys=True)
+
+
+if __name__ == '__main__':
+    main()
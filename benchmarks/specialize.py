@@ -0,0 +1,102 @@
+"""Compares generic and signature specialized advised functions.
+
+Usage:
+
+    python benchmarks/specialize.py
+
+"""
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from timeit import repeat
+
+from easyaspect import Pointcut
+from easyaspect.advice import _Advice
+
+NUMBER = 100000
+
+
+def create_class():
+    """Creates a new class, so each advised version has its own."""
+    class Dummy(object):
+        def args_0(self):
+            pass
+
+        def args_3(self, a, b, c):
+            pass
+
+        def args_8(self, a, b, c, d, e, f, g, h):
+            pass
+
+    return Dummy
+
+
+CALLS = {
+    'args_0': lambda obj: obj.args_0(),
+    'args_3': lambda obj: obj.args_3(1, 2, 3),
+    'args_8': lambda obj: obj.args_8(1, 2, 3, 4, 5, 6, 7, 8),
+}
+
+
+def before(cls, joinpoint, obj, *args, **kwargs):
+    pass
+
+
+def around(cls, joinpoint, next_, obj, *args, **kwargs):
+    return next_(obj, *args, **kwargs)
+
+
+def make_class(specialize):
+    """Creates a class with all methods advised."""
+    cls = create_class()
+    pointcut = Pointcut([getattr(cls, name) for name in sorted(CALLS)],
+                        specialize=specialize)
+    pointcut.add_advice(_Advice('before', pointcut, 'all', before))
+    pointcut.add_advice(_Advice('around', pointcut, 'all', around))
+    return cls
+
+
+def measure(cls, name, number=NUMBER):
+    """Returns the best time, in microseconds, of a call to `name`."""
+    obj = cls()
+    call = CALLS[name]
+    best = min(repeat(lambda: call(obj), number=number, repeat=3))
+    return best / number * 1e6
+
+
+def get_classes():
+    return [('original', create_class()), ('generic', make_class(False)),
+            ('specialized', make_class(True))]
+
+
+def run(number=NUMBER):
+    """Runs all cases and returns a list of results."""
+    results = []
+    classes = get_classes()
+    for name in sorted(CALLS):
+        baseline = measure(classes[0][1], name, number)
+        for label, cls in classes[1:]:
+            time = measure(cls, name, number)
+            results.append({
+                'suite': 'specialize',
+                'group': label,
+                'params': {'args': int(name.split('_')[1])},
+                'baseline_us': baseline,
+                'time_us': time,
+                'overhead_us': time - baseline,
+            })
+    return results
+
+
+def main():
+    classes = get_classes()
+    print '{:<10}'.format('method') + ''.join(
+        '{:>14}'.format(label) for label, _ in classes)
+    for name in sorted(CALLS):
+        print '{:<10}'.format(name) + ''.join(
+            '{:>12.3f}us'.format(measure(cls, name)) for _, cls in classes)
+
+
+if __name__ == '__main__':
+    main()
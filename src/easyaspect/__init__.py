@@ -1,5 +1,8 @@
 from .advice import before, after, around
 from .aspect import Aspect
-from .pointcut import Pointcut, reset
+from .expression import Pattern, Predicate
+from .pointcut import Pointcut, reset, unweave_all
+from .utils import register
 
-__all__ = ['reset', 'before', 'after', 'around', 'Aspect', 'Pointcut']
+__all__ = ['reset', 'before', 'after', 'around', 'Aspect', 'Pointcut',
+           'register', 'unweave_all', 'Pattern', 'Predicate']
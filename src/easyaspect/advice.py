@@ -1,3 +1,6 @@
+from .background import get_default_worker
+from .guard import Guard
+
 # There will be one decorator for each item in this list
 ADVICE_TYPES = ['before', 'after', 'around']
 
@@ -7,12 +10,26 @@ class _Advice(object):
 
     To define advices use the advice decorators with `Aspect` class methods.
     """
-    def __init__(self, type, pointcut, target, func):
+    __slots__ = ('type', 'pointcut', 'target', 'func', 'name', 'sample',
+                 'background', 'guard', 'bind', 'aspect')
+
+    def __init__(self, type, pointcut, target, func, sample=None,
+                 background=None, guard=None, bind=False):
         self.type = type
         self.pointcut = pointcut
         self.target = target
         self.func = func
         self.name = func.__name__
+        # Sampling policy, see `easyaspect.sampling`
+        self.sample = sample
+        # `Worker` running the advice, see `easyaspect.background`
+        self.background = background
+        # `Guard` choosing the calls running the advice, see
+        # `easyaspect.guard`
+        self.guard = guard
+        # If the advice receives the arguments bound to their names, see
+        # `easyaspect.binding`
+        self.bind = bind
 
     def __call__(self, *args, **kwargs):
         return self.func(*args, **kwargs)
@@ -20,17 +37,34 @@ class _Advice(object):
 
 def _make_advice_decorator(advice_type):
     """Makes new advice decorators to be used within `Aspect` subclasses."""
-    def advice_decorator(pointcut, target=None):
+    def advice_decorator(pointcut, target=None, sample=None, background=None,
+                         guard=None, bind=False):
         # `pointcut` can be a `Pointcut` object, a string containing the name
         # of the `Aspect` class attribute containing a `Pointcut` object or
         # a string or a list of strings containing joinpoints.
         # The value of `pointcut` is handled by `_AspectMetaClass.__new__`.
+        # `sample` can be a policy from `easyaspect.sampling` to run the
+        # advice only on some calls.
+        # `background` can be `True` or a `Worker` from `easyaspect.background`
+        # to run 'after' advices in a background thread.
+        # `guard` can be a function of the arguments of the advised function
+        # or a `Guard` from `easyaspect.guard` to run the advice only on the
+        # calls it matches.
+        # `bind=True` passes the arguments to the advice as a dictionary
+        # mapping the parameter names to their values.
+        if background is True:
+            background = get_default_worker()
+        if background and advice_type != 'after':
+            raise ValueError('Only \'after\' advices can run in background')
+        if guard is not None and not isinstance(guard, Guard):
+            guard = Guard(guard)
         def wrapper(func):
             # Make sure the `_advices` attribute exists
             func._advices = getattr(func, '_advices', [])
             # Add the current advice to the list of advices
             func._advices.append(
-                _Advice(advice_type, pointcut, target, func))
+                _Advice(advice_type, pointcut, target, func, sample,
+                        background, guard, bind))
             # Return the function itself
             return func
         return wrapper
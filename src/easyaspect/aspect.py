@@ -1,6 +1,9 @@
 from collections import defaultdict
 
 from .pointcut import Pointcut
+from .scope import Scope
+from .stats import combine
+from .utils import weaving
 
 __all__ = ['Aspect']
 
@@ -12,7 +15,22 @@ class _AspectMetaClass(type):
     aspect use the `Aspect` class.
     """
     def __new__(mcls, name, bases, attrs):
+        # All pointcuts created for the aspect share the same weaving pass
+        with weaving():
+            return mcls._create(name, bases, attrs)
+
+    @classmethod
+    def _create(mcls, name, bases, attrs):
         advices = defaultdict(list)
+        # Advices of pointcuts named by strings, inherited by subclasses
+        named_advices = defaultdict(list)
+        for base_cls in reversed(bases):
+            for pointcut_name, base_advices in getattr(
+                    base_cls, '_named_advices', {}).items():
+                named_advices[pointcut_name] += [
+                    advice for advice in base_advices
+                    # Overridden advices are replaced
+                    if advice.name not in attrs]
         cls = super(_AspectMetaClass, mcls).__new__(mcls, name, bases, attrs)
         cls._pointcuts = []
         pointcuts = []
@@ -43,6 +61,7 @@ class _AspectMetaClass(type):
                         #     def f(cls, joinpoint, obj, *args, **kwargs):
                         #         ...
                         pointcut_name = advice.pointcut
+                        named_advices[pointcut_name].append(advice)
                     elif not hasattr(advice.pointcut, 'add_advice'):
                         # Probably a joinpoint, created by some code like
                         #
@@ -80,12 +99,22 @@ class _AspectMetaClass(type):
                             advice.pointcut.add_advice(advice)
                             advice.pointcut.aspect = cls
                     advices[pointcut_name].append(advice)
-        # Associate the named pointcuts with its advices
+        cls._named_advices = dict(named_advices)
+        # Associate the named pointcuts with its advices. Pointcuts can be
+        # declared as `None` by reusable aspects and defined by subclasses,
+        # which inherit the advices.
         for pointcut in pointcuts:
             if not pointcut in cls._pointcuts:
                 cls._pointcuts.append(pointcut)
-            for advice in advices.get(pointcut.name, []):
+            for advice in advices.get(pointcut.name, []) + [
+                    advice for advice in named_advices.get(pointcut.name, [])
+                    if not advice in advices[pointcut.name]]:
                 pointcut.add_advice(advice)
+        # Scoped aspects run their advices only while active
+        cls._scope = Scope() if getattr(cls, 'scoped', False) else None
+        if cls._scope:
+            for pointcut in cls._pointcuts:
+                pointcut.set_scope(cls._scope)
         return cls
 
 
@@ -104,7 +133,10 @@ class Aspect(object):
             def before_pointcut_name(cls, joinpoint, obj, *args, **kwargs):
                 ...
 
+    Set `scoped = True` in the class to run the advices only inside
+    `with AspectName.active():` blocks.
     """
+    scoped = False
     __metaclass__ = _AspectMetaClass
 
     @classmethod
@@ -116,3 +148,33 @@ class Aspect(object):
     def disable(cls, *args, **kwargs):
         for pointcut in cls._pointcuts:
             pointcut.disable(*args, **kwargs)
+
+    @classmethod
+    def unweave(cls):
+        """Puts back the original attributes replaced by the aspect
+        pointcuts, see `Pointcut.unweave`."""
+        for pointcut in cls._pointcuts:
+            pointcut.unweave()
+
+    @classmethod
+    def instrument(cls, enabled=True):
+        """Starts or stops recording call counts and times of the advised
+        functions and of the advices."""
+        for pointcut in cls._pointcuts:
+            pointcut.instrument(enabled)
+
+    @classmethod
+    def stats(cls):
+        """Returns the call counts and times recorded by `instrument`.
+
+        See `easyaspect.stats.Stats.snapshot`.
+        """
+        return combine(*[pointcut.stats() for pointcut in cls._pointcuts])
+
+    @classmethod
+    def active(cls):
+        """Returns a context manager activating the advices of a scoped
+        aspect in the current thread."""
+        if cls._scope is None:
+            raise ValueError('{} is not scoped'.format(cls.__name__))
+        return cls._scope.activate()
@@ -0,0 +1,144 @@
+"""Execution of 'after' advices in a background thread.
+
+Pass `background=True` (or a `Worker`) to the `after` decorator to run the
+advice off the caller thread:
+
+    class AuditAspect(Aspect):
+        @after('Repository.save', background=True)
+        def audit(cls, method_name, result, obj, *args, **kwargs):
+            ...
+
+Background advices receive the value returned by the advised function after
+the joinpoint name, like 'around' advices receive the next function. The
+caller only pays for putting the call in the worker queue.
+"""
+import atexit
+import logging
+import threading
+from Queue import Queue, Full
+
+__all__ = ['Worker', 'DROP', 'BLOCK', 'INLINE', 'get_default_worker']
+
+logger = logging.getLogger(__name__)
+
+# What to do when the queue is full
+DROP = 'drop'
+BLOCK = 'block'
+INLINE = 'inline'
+
+OVERFLOW_POLICIES = (DROP, BLOCK, INLINE)
+
+# Put in the queue to stop the worker thread
+_STOP = object()
+
+
+class Worker(object):
+    """Runs queued calls in a background thread.
+
+    The queue holds at most `maxsize` calls. When it is full new calls are
+    dropped, block the caller or run in the caller thread, according to
+    `overflow`. The thread is started with the first call. Calls after
+    `shutdown` are dropped.
+    """
+    def __init__(self, maxsize=1000, overflow=DROP):
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(
+                '\'overflow\' must be one of {} but got {}'.format(
+                    ', '.join(OVERFLOW_POLICIES), overflow))
+        self.queue = Queue(maxsize)
+        self.overflow = overflow
+        self.dropped = 0
+        self._thread = None
+        self._closed = False
+        # Protects the thread, the closed state and `dropped`
+        self._lock = threading.Lock()
+
+    def _start(self):
+        """Starts the thread, returns `False` if the worker is shut down.
+
+        Called with the lock held.
+        """
+        if self._closed:
+            self.dropped += 1
+            return False
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._run, name='easyaspect-worker')
+            self._thread.daemon = True
+            self._thread.start()
+        return True
+
+    def _run(self):
+        while True:
+            item = self.queue.get()
+            try:
+                if item is _STOP:
+                    return
+                func, args, kwargs = item
+                func(*args, **kwargs)
+            except Exception:
+                logger.exception('Error running background advice')
+            finally:
+                self.queue.task_done()
+
+    def submit(self, func, args, kwargs):
+        """Queues a call to `func`."""
+        # Queued with the lock held, so no call is queued after `_STOP`
+        with self._lock:
+            if (self._thread is None or self._closed) and not self._start():
+                return
+            try:
+                self.queue.put_nowait((func, args, kwargs))
+                return
+            except Full:
+                if self.overflow == BLOCK:
+                    self.queue.put((func, args, kwargs))
+                    return
+                if self.overflow == DROP:
+                    self.dropped += 1
+                    return
+        func(*args, **kwargs)
+
+    def wrap(self, func):
+        """Returns a function queuing the calls to `func`."""
+        submit = self.submit
+
+        def submitter(*args, **kwargs):
+            submit(func, args, kwargs)
+        return submitter
+
+    def flush(self):
+        """Waits until all queued calls are done."""
+        if self._thread is not None:
+            self.queue.join()
+
+    def shutdown(self):
+        """Runs the queued calls and stops the thread.
+
+        Later calls are dropped.
+        """
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            thread = self._thread
+        if thread is not None:
+            self.queue.put(_STOP)
+            thread.join()
+
+
+_default_worker = []
+_default_worker_lock = threading.Lock()
+
+
+def get_default_worker():
+    """Returns the worker used by advices with `background=True`.
+
+    It is shut down, running the queued calls, when the interpreter exits.
+    """
+    with _default_worker_lock:
+        if not _default_worker:
+            worker = Worker()
+            atexit.register(worker.shutdown)
+            _default_worker.append(worker)
+    return _default_worker[0]
@@ -0,0 +1,226 @@
+"""Reusable aspect coalescing calls into batches.
+
+Subclass `BatchAspect`, define the `batched` pointcut and set `batch` to a
+static method running a list of calls at once:
+
+    def save_all(joinpoint, calls):
+        items = [args[0] for obj, args, kwargs in calls]
+        return database.insert_many(items)
+
+    class BatchedSaves(BatchAspect):
+        batched = Pointcut('Repository.save')
+        batch = staticmethod(save_all)
+        size = 100
+        interval = 0.5
+
+Calls to the advised functions are buffered and return a `Future`. The
+buffered calls of each advised function, told apart by class, are passed to
+`batch` with the name of the function, see `JoinpointName`, as a list of
+`(obj, args, kwargs)` tuples, once `size` calls are buffered, in the calling
+thread, or `interval` seconds after the first one, in a background thread.
+`batch` returns a list with the result of each call, which can be a
+`Failure` to make that call fail, and exceptions raised by `batch` make all
+calls of the batch fail. The buffered calls are flushed when the
+interpreter exits.
+
+`Future` is the one from `concurrent.futures` if installed.
+"""
+import atexit
+import sys
+import threading
+import weakref
+from timeit import default_timer as clock
+
+from .advice import around
+from .aspect import Aspect
+
+__all__ = ['BatchAspect', 'Batcher', 'Failure', 'Future', 'flush_all']
+
+try:
+    from concurrent.futures import Future
+except ImportError:
+    class Future(object):
+        """Result of a call not made yet, the subset of
+        `concurrent.futures.Future` used by batches."""
+        def __init__(self):
+            self._event = threading.Event()
+            self._result = None
+            self._exception = None
+
+        def done(self):
+            return self._event.is_set()
+
+        def result(self, timeout=None):
+            """Waits for the call and returns its result, raising its
+            exception if it failed."""
+            if self.exception(timeout) is not None:
+                raise self._exception
+            return self._result
+
+        def exception(self, timeout=None):
+            """Waits for the call and returns its exception, if any."""
+            if not self._event.wait(timeout):
+                raise RuntimeError('Timed out waiting the call')
+            return self._exception
+
+        def set_result(self, result):
+            self._result = result
+            self._event.set()
+
+        def set_exception(self, exception):
+            self._exception = exception
+            self._event.set()
+
+
+class Failure(object):
+    """Result of a call from a batch that failed with `exception`."""
+    def __init__(self, exception):
+        self.exception = exception
+
+
+# All batchers, flushed at exit
+_batchers = weakref.WeakSet()
+
+
+class Batcher(object):
+    """Buffers calls and passes them to `func` in batches of at most `size`
+    calls, waiting at most `interval` seconds.
+
+    The thread flushing the calls after `interval` is started with the first
+    call and stops once no call is buffered, so idle batchers can be
+    collected.
+    """
+    def __init__(self, func, size=100, interval=0.1):
+        self.func = func
+        self.size = size
+        self.interval = interval
+        # (future, obj, args, kwargs) for each buffered call
+        self._calls = []
+        # When the buffered calls must be flushed
+        self._deadline = None
+        self._condition = threading.Condition(threading.Lock())
+        self._thread = None
+        _batchers.add(self)
+
+    def _start(self):
+        self._thread = threading.Thread(target=self._run,
+                                        name='easyaspect-batcher')
+        self._thread.daemon = True
+        self._thread.start()
+
+    def _run(self):
+        condition = self._condition
+        while True:
+            with condition:
+                if self._deadline is None:
+                    # The next call starts a new thread
+                    self._thread = None
+                    return
+                timeout = self._deadline - clock()
+                if timeout > 0:
+                    condition.wait(timeout)
+                    continue
+                calls = self._take()
+            self._call(calls)
+
+    def _take(self):
+        calls, self._calls = self._calls, []
+        self._deadline = None
+        return calls
+
+    def _call(self, calls):
+        try:
+            results = self.func([call[1:] for call in calls])
+            if len(results) != len(calls):
+                raise ValueError(
+                    'Batch returned {} results for {} calls'.format(
+                        len(results), len(calls)))
+        except Exception:
+            exception = sys.exc_info()[1]
+            for call in calls:
+                call[0].set_exception(exception)
+            return
+        for call, result in zip(calls, results):
+            if isinstance(result, Failure):
+                call[0].set_exception(result.exception)
+            else:
+                call[0].set_result(result)
+
+    def submit(self, obj, args, kwargs):
+        """Buffers a call and returns its future."""
+        future = Future()
+        calls = None
+        with self._condition:
+            self._calls.append((future, obj, args, kwargs))
+            if len(self._calls) >= self.size:
+                calls = self._take()
+            elif len(self._calls) == 1:
+                self._deadline = clock() + self.interval
+                if self._thread is None:
+                    self._start()
+                self._condition.notify()
+        if calls:
+            self._call(calls)
+        return future
+
+    def flush(self):
+        """Passes the buffered calls to `func` now."""
+        with self._condition:
+            calls = self._take()
+        if calls:
+            self._call(calls)
+
+
+@atexit.register
+def flush_all():
+    """Flushes the calls buffered by all batchers."""
+    for batcher in list(_batchers):
+        batcher.flush()
+
+
+_batchers_lock = threading.Lock()
+
+
+class BatchAspect(Aspect):
+    """Coalesces the calls to the functions of the `batched` pointcut, see
+    `easyaspect.batch`."""
+    batched = None
+    batch = None
+    size = 100
+    interval = 0.1
+
+    @around('batched')
+    def buffer(cls, joinpoint, next_, obj, *args, **kwargs):
+        return cls.get_batcher(joinpoint).submit(obj, args, kwargs)
+
+    @classmethod
+    def get_batcher(cls, joinpoint):
+        """Returns the batcher of `joinpoint`, the name passed to the
+        advice, see `JoinpointName`."""
+        # Names without class share a batcher per aspect
+        owner = getattr(joinpoint, 'owner', None) or cls
+        batcher = vars(cls).get('_batchers', {}).get(owner, {}).get(
+            joinpoint)
+        if batcher is None:
+            if cls.batch is None:
+                raise NotImplementedError(
+                    '{}.batch is not defined'.format(cls.__name__))
+            with _batchers_lock:
+                if '_batchers' not in vars(cls):
+                    # Advised classes may be collected
+                    cls._batchers = weakref.WeakKeyDictionary()
+                batchers = cls._batchers.setdefault(owner, {})
+                batcher = batchers.get(joinpoint)
+                if batcher is None:
+                    batch = cls.batch
+                    batcher = batchers[joinpoint] = Batcher(
+                        lambda calls: batch(joinpoint, calls), cls.size,
+                        cls.interval)
+        return batcher
+
+    @classmethod
+    def flush(cls):
+        """Flushes the calls buffered for all joinpoints."""
+        for batchers in vars(cls).get('_batchers', {}).values():
+            for batcher in batchers.values():
+                batcher.flush()
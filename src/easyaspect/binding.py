@@ -0,0 +1,83 @@
+"""Arguments of advised calls bound to their parameter names.
+
+Advices declared with `bind=True` receive the arguments of the call as a
+dictionary mapping the parameter names to their values, like
+`inspect.getcallargs` returns, instead of `*args, **kwargs`:
+
+    class AuditAspect(Aspect):
+        @before('Account.transfer', bind=True)
+        def audit(cls, method_name, arguments):
+            log(arguments['self'], arguments['amount'])
+
+        @around('Account.transfer', bind=True)
+        def limit(cls, method_name, next_, arguments):
+            if arguments['amount'] > LIMIT:
+                arguments = dict(arguments, amount=LIMIT)
+            return next_(arguments)
+
+'after' advices running in background receive the returned value before the
+arguments. 'around' advices continue the call passing the arguments to
+`next_`, a changed copy to change them. Guards of bound advices receive the
+arguments too.
+
+The arguments are bound at most once per call and the same dictionary is
+passed to all the bound advices until an 'around' advice changes them, so it
+must not be changed in place. The function binding them is generated once
+per advised function, with its exact signature, so binding costs a single
+call.
+"""
+from functools import partial
+from inspect import getargspec, getcallargs
+from types import FunctionType
+
+__all__ = ['Binder']
+
+
+def _compile(args, varargs, keywords, defaults):
+    """Returns a function with the given signature returning its arguments
+    in a dictionary."""
+    names = list(args)
+    params = list(args)
+    if varargs:
+        names.append(varargs)
+        params.append('*' + varargs)
+    if keywords:
+        names.append(keywords)
+        params.append('**' + keywords)
+    source = 'def bind({}):\n    return {{{}}}\n'.format(
+        ', '.join(params), ', '.join('{0!r}: {0}'.format(name)
+                                      for name in names))
+    namespace = {}
+    exec source in namespace
+    return FunctionType(namespace['bind'].func_code, {}, None, defaults)
+
+
+class Binder(object):
+    """Binds the arguments of calls to `func` to the names of its
+    parameters.
+
+    `bind(*args, **kwargs)` returns the dictionary of the arguments of a
+    call and `unbind` the arguments of the call from it.
+    """
+    def __init__(self, func):
+        self.func = func
+        args, varargs, keywords, defaults = getargspec(func)
+        self.args, self.varargs, self.keywords = args, varargs, keywords
+        # Tuple parameters can't be bound by name
+        if all(isinstance(arg, basestring) for arg in args):
+            self.bind = _compile(args, varargs, keywords, defaults)
+        else:
+            self.args = None
+            self.bind = partial(getcallargs, func)
+
+    def unbind(self, arguments):
+        """Returns the `(args, kwargs)` of a call from its `arguments`."""
+        if self.args is None:
+            raise TypeError(
+                'Can\'t change the arguments of {}, it has tuple '
+                'parameters'.format(self.func))
+        args = [arguments[name] for name in self.args]
+        if self.varargs:
+            args += arguments[self.varargs]
+        kwargs = dict(arguments[self.keywords]) if self.keywords else {}
+        return args, kwargs
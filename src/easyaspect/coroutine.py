@@ -0,0 +1,86 @@
+"""Advising generator based coroutines.
+
+Advising a generator function with the usual chain would run the advices
+around the creation of the generator instead of its execution. For generator
+functions the chain is itself a generator: 'before' advices run when the
+coroutine starts and 'after' advices when it finishes. Advices that are
+generator functions are delegated to, like the target, so they can wait on
+the scheduler too, without blocking it.
+
+As Python 2 generators can't return values, coroutine libraries raise an
+exception carrying it (`tornado.gen.Return`, `trollius.Return`). These
+exceptions are recognized by their types in `RETURN_EXCEPTIONS`, the 'after'
+advices run and the exception is raised again.
+"""
+import sys
+from inspect import isgenerator
+
+__all__ = ['RETURN_EXCEPTIONS', 'delegate', 'make_call']
+
+RETURN_EXCEPTIONS = []
+try:
+    from tornado.gen import Return
+    RETURN_EXCEPTIONS.append(Return)
+except ImportError:
+    pass
+try:
+    from trollius import Return
+    RETURN_EXCEPTIONS.append(Return)
+except ImportError:
+    pass
+
+
+def delegate(steps, returned):
+    """Runs the generators from `steps` in sequence, as a single generator.
+
+    Values yielded by each generator are yielded to the caller and the values
+    or exceptions sent by the caller are forwarded to the generator, like
+    `yield from` does in Python 3. Items from `steps` that are not generators
+    are ignored. The value of a return exception is put in `returned[0]`.
+    """
+    return_exc_info = None
+    for gen in steps:
+        if not isgenerator(gen):
+            continue
+        value, exc_info = None, None
+        while True:
+            try:
+                if exc_info:
+                    yielded = gen.throw(*exc_info)
+                else:
+                    yielded = gen.send(value)
+            except StopIteration:
+                break
+            except tuple(RETURN_EXCEPTIONS):
+                return_exc_info = sys.exc_info()
+                returned[0] = getattr(return_exc_info[1], 'value', None)
+                break
+            try:
+                value, exc_info = (yield yielded), None
+            except GeneratorExit:
+                gen.close()
+                raise
+            except BaseException:
+                value, exc_info = None, sys.exc_info()
+    if return_exc_info:
+        raise return_exc_info[0], return_exc_info[1], return_exc_info[2]
+
+
+def make_call(func, name, befores, afters, returnings):
+    """Returns the generator function running the coroutine `func` with
+    'before' and 'after' advices."""
+    def call(*args, **kwargs):
+        returned = [None]
+
+        def steps():
+            # Execute 'before' advices
+            for before, aspect in befores:
+                yield before(aspect, name, *args, **kwargs)
+            yield func(*args, **kwargs)
+            # Execute 'after' advices
+            for after, aspect in afters:
+                yield after(aspect, name, *args, **kwargs)
+            for after, aspect in returnings:
+                yield after(aspect, name, returned[0], *args, **kwargs)
+        return delegate(steps(), returned)
+    return call
@@ -0,0 +1,109 @@
+"""Data descriptor replacing advised attributes.
+
+Advised attributes are replaced in their class by an `AdvisedAttribute`. The
+values stay where they were stored: in the instance `__dict__`, in the slot
+of classes using `__slots__` or behind the original `property`. Reads and
+writes go through the advised accessors only when they are set, otherwise
+they cost a single call to `__get__` or `__set__`.
+"""
+import weakref
+from types import MemberDescriptorType
+
+__all__ = ['AdvisedAttribute']
+
+
+class AdvisedAttribute(object):
+    """Data descriptor for the attribute `name` of `owner`, replacing
+    `original`.
+
+    `original` is the class attribute being replaced: a slot, a property or
+    a plain value, which is returned for instances without their own value.
+    `get` and `set` are the functions reading and writing the value, `None`
+    if the attribute can't be read or written. `fget` and `fset` are their
+    advised versions, `None` while not advised. `inherited` tells if `owner`
+    inherited the attribute instead of defining it.
+    """
+    __slots__ = ('name', 'original', 'owner', 'inherited', 'storage', 'get',
+                 'set', 'fget', 'fset', '__weakref__')
+
+    def __init__(self, name, original, owner=None):
+        self.name = name
+        self.original = original
+        # Weak reference to the class, used to put `original` back
+        self.owner = weakref.ref(owner) if owner is not None else None
+        self.inherited = owner is not None and name not in vars(owner)
+        if isinstance(original, property):
+            self.storage = original
+            self.get, self.set = original.fget, original.fset
+        elif isinstance(original, MemberDescriptorType):
+            self.storage = original
+            self.get, self.set = _make_accessors(name, original)
+        else:
+            self.storage = None
+            self.get, self.set = _make_accessors(name, original, False)
+        self.fget = None
+        self.fset = None
+
+    def __get__(self, obj, cls=None):
+        if obj is None:
+            return self
+        if self.fget is not None:
+            return self.fget(obj)
+        if self.storage is not None:
+            return self.storage.__get__(obj, cls)
+        try:
+            return obj.__dict__[self.name]
+        except (AttributeError, KeyError):
+            return self.original
+
+    def __set__(self, obj, value):
+        if self.fset is not None:
+            self.fset(obj, value)
+        elif self.storage is not None:
+            self.storage.__set__(obj, value)
+        else:
+            obj.__dict__[self.name] = value
+
+    def restore(self):
+        """Puts the original attribute back in the class once neither
+        accessor is advised."""
+        owner = self.owner and self.owner()
+        if (self.fget is None and self.fset is None and owner is not None and
+                vars(owner).get(self.name) is self):
+            if self.inherited:
+                # Let the class inherit the attribute again
+                delattr(owner, self.name)
+            else:
+                setattr(owner, self.name, self.original)
+
+    def __delete__(self, obj):
+        if self.storage is not None:
+            self.storage.__delete__(obj)
+        elif obj.__dict__.pop(self.name, _MISSING) is _MISSING:
+            raise AttributeError(self.name)
+
+
+_MISSING = object()
+
+
+def _make_accessors(name, original, slot=True):
+    """Returns the functions reading and writing the attribute `name` in the
+    `original` slot or, with `slot=False`, in the instance `__dict__`."""
+    if slot:
+        def getter(obj):
+            return original.__get__(obj, obj.__class__)
+
+        def setter(obj, value):
+            original.__set__(obj, value)
+    else:
+        def getter(obj):
+            try:
+                return obj.__dict__[name]
+            except (AttributeError, KeyError):
+                return original
+
+        def setter(obj, value):
+            obj.__dict__[name] = value
+    # Advices get the name of the attribute
+    getter.__name__ = setter.__name__ = name
+    return getter, setter
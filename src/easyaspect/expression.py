@@ -0,0 +1,160 @@
+"""Joinpoint expressions combining patterns and predicates.
+
+Patterns and predicates are combined with `&`, `|` and `~` and passed to
+`Pointcut` like joinpoints:
+
+    saves = Pattern('pkg.models.*.save*') & ~Pattern('*Test*.*')
+    exposed = Pattern('pkg.api.*.*') & Predicate(
+        lambda cls, name, member: getattr(member, 'exposed', False))
+
+    class LoggerAspect(Aspect):
+        calls = Pointcut(saves | exposed)
+
+The expression is compiled into a single matcher and the members of the
+classes selected by its patterns are tested in one pass, each member once,
+so overlapping patterns never wrap a function twice. Negated patterns and
+predicates only filter the members, so an expression needs at least one
+pattern not negated.
+"""
+import sys
+
+from .utils import compile_pattern, filter_names, get_classes
+
+__all__ = ['Expression', 'Pattern', 'Predicate']
+
+
+class Expression(object):
+    """Base class of joinpoint expressions.
+
+    Subclasses define `compile`, returning a function testing if the member
+    `name` of a class, called with the class and the name, matches the
+    expression.
+    """
+    def __and__(self, other):
+        return _And(self, other)
+
+    def __or__(self, other):
+        return _Or(self, other)
+
+    def __invert__(self):
+        return _Not(self)
+
+    def get_patterns(self, negated=False):
+        """Returns the patterns selecting classes, the ones not negated."""
+        return []
+
+    def get_members(self, filter_func=lambda a: True):
+        """Returns a list of the members matching the expression, like
+        `utils.get_members`."""
+        patterns = self.get_patterns()
+        if not patterns:
+            raise ValueError(
+                'Expression {!r} has no pattern selecting classes'.format(
+                    self))
+        classes = []
+        for pattern in patterns:
+            for cls in get_classes(pattern.class_path):
+                if not any(cls is seen for seen in classes):
+                    classes.append(cls)
+        match = self.compile()
+        members = []
+        for cls in classes:
+            attrs = ((name, getattr(cls, name))
+                     for name in filter_names(cls, '*') if match(cls, name))
+            members.append(
+                (cls, [(name, attr) for name, attr in attrs
+                       if filter_func(attr)]))
+        return members
+
+
+class Pattern(Expression):
+    """Matches members by a pattern like the joinpoint strings,
+    '[module.]Class.member', that can contain wildcards except in the module
+    name.
+
+    Classes match when their name matches and, with a module name, when the
+    module has them, even if imported from another module.
+    """
+    def __init__(self, pattern):
+        parts = pattern.rsplit('.', 2)
+        if len(parts) < 2:
+            raise ValueError(
+                '\'pattern\' must be like [module.]Class.member but got '
+                '{}'.format(pattern))
+        self.pattern = pattern
+        self.module_name = parts[0] if len(parts) == 3 else None
+        self.class_pattern, self.member_pattern = parts[-2:]
+        self.class_path = pattern.rsplit('.', 1)[0]
+
+    def __repr__(self):
+        return 'Pattern({!r})'.format(self.pattern)
+
+    def get_patterns(self, negated=False):
+        return [] if negated else [self]
+
+    def compile(self):
+        match_class = compile_pattern(self.class_pattern)
+        match_member = compile_pattern(self.member_pattern)
+        module_name = self.module_name
+
+        def match(cls, name):
+            if not (match_member(name) and match_class(cls.__name__)):
+                return False
+            if module_name is None:
+                return True
+            module = sys.modules.get(module_name)
+            return getattr(module, cls.__name__, None) is cls
+        return match
+
+
+class Predicate(Expression):
+    """Matches members for which `func(cls, name, member)` is true."""
+    def __init__(self, func):
+        self.func = func
+
+    def __repr__(self):
+        return 'Predicate({!r})'.format(self.func)
+
+    def compile(self):
+        func = self.func
+        return lambda cls, name: func(cls, name, getattr(cls, name))
+
+
+class _And(Expression):
+    def __init__(self, left, right):
+        self.left, self.right = left, right
+
+    def __repr__(self):
+        return '({!r} & {!r})'.format(self.left, self.right)
+
+    def get_patterns(self, negated=False):
+        return (self.left.get_patterns(negated) +
+                self.right.get_patterns(negated))
+
+    def compile(self):
+        left, right = self.left.compile(), self.right.compile()
+        return lambda cls, name: left(cls, name) and right(cls, name)
+
+
+class _Or(_And):
+    def __repr__(self):
+        return '({!r} | {!r})'.format(self.left, self.right)
+
+    def compile(self):
+        left, right = self.left.compile(), self.right.compile()
+        return lambda cls, name: left(cls, name) or right(cls, name)
+
+
+class _Not(Expression):
+    def __init__(self, operand):
+        self.operand = operand
+
+    def __repr__(self):
+        return '~{!r}'.format(self.operand)
+
+    def get_patterns(self, negated=False):
+        return self.operand.get_patterns(not negated)
+
+    def compile(self):
+        operand = self.operand.compile()
+        return lambda cls, name: not operand(cls, name)
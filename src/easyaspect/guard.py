@@ -0,0 +1,135 @@
+"""Guards deciding if advices run, checked before calling them.
+
+Pass a guard to the advice decorators to run the advice only on the calls it
+matches. A guard is a function receiving the arguments of the advised
+function, the object first, or a test on a single argument:
+
+    class AccessControl(Aspect):
+        @around('Repository.read',
+                guard=lambda obj, req: req.get('page') in PROTECTED)
+        def check_read_permission(cls, method_name, next, obj, req):
+            ...
+
+        @before('Repository.delete', guard=In('page', PROTECTED))
+        def check_delete_permission(cls, method_name, obj, page):
+            ...
+
+Calls not matched skip the advice like sampled out calls: 'before' and
+'after' advices are not called at all, 'around' advices are replaced by a
+direct call to the next function. `In` finds the position of the argument
+once per advised function, so each call costs a lookup in a set.
+"""
+from inspect import getargspec
+
+__all__ = ['Guard', 'In']
+
+_MISSING = object()
+
+
+class Guard(object):
+    """Runs the advice on calls for which `func(obj, *args, **kwargs)` is
+    true, or `func(arguments)` for advices with `bind=True`."""
+    def __init__(self, func):
+        self.func = func
+
+    def compile(self, function, bound=False):
+        """Returns a function testing the arguments of calls to `function`
+        or, with `bound=True`, their dictionary, see `easyaspect.binding`."""
+        return self.func
+
+    def gate(self, advice, function, around=False, returning=False,
+             bound=False):
+        """Returns a function calling `advice` only on the calls to
+        `function` matched by the guard.
+
+        With `returning=True` the advice receives the returned value before
+        the arguments, with `bound=True` it receives the arguments bound to
+        their names.
+        """
+        test = self.compile(function, bound)
+        if around:
+            def gate(aspect, name, next_, *args, **kwargs):
+                if test(*args, **kwargs):
+                    return advice(aspect, name, next_, *args, **kwargs)
+                return next_(*args, **kwargs)
+        elif returning:
+            def gate(aspect, name, ret, *args, **kwargs):
+                if test(*args, **kwargs):
+                    return advice(aspect, name, ret, *args, **kwargs)
+        else:
+            def gate(aspect, name, *args, **kwargs):
+                if test(*args, **kwargs):
+                    return advice(aspect, name, *args, **kwargs)
+        return gate
+
+
+class In(Guard):
+    """Runs the advice on calls where the argument `argument`, a name or a
+    position counting the object, is one of `values`.
+
+    `values` must be hashable. Arguments not passed take their default
+    value. Functions without the argument never run the advice.
+    """
+    def __init__(self, argument, values):
+        self.argument = argument
+        self.values = frozenset(values)
+
+    def __repr__(self):
+        return 'In({!r}, {!r})'.format(self.argument, sorted(self.values))
+
+    def compile(self, function, bound=False):
+        values = self.values
+        if (isinstance(self.argument, (int, long)) and function is None and
+                not bound):
+            # Only the position is known, without keyword nor default
+            position, name, default = self.argument, None, _MISSING
+        else:
+            try:
+                position, name, default = _find_argument(function,
+                                                         self.argument)
+            except TypeError:
+                # Pointcuts with wildcards may match unrelated functions
+                return lambda *args, **kwargs: False
+        if bound:
+            if position is None:
+                # Passed in the keyword arguments dictionary
+                keywords = getargspec(function).keywords
+                return lambda arguments: (
+                    arguments[keywords].get(name, _MISSING) in values)
+            return lambda arguments: arguments[name] in values
+        if position is None:
+            return lambda *args, **kwargs: (
+                kwargs.get(name, default) in values)
+
+        def test(*args, **kwargs):
+            if len(args) > position:
+                return args[position] in values
+            return kwargs.get(name, default) in values
+        return test
+
+
+def _find_argument(function, name):
+    """Returns the position and the default value of the argument `name`, or
+    at the position `name`, of `function`, as `(position, name, default)`.
+
+    The position is `None` if it can only be passed by keyword. Raises
+    `TypeError` if `function` has no such argument.
+    """
+    try:
+        args, varargs, keywords, defaults = getargspec(function)
+    except TypeError:
+        raise TypeError('Can\'t find the arguments of {}'.format(function))
+    if isinstance(name, (int, long)):
+        if not 0 <= name < len(args):
+            raise TypeError('{} has no argument at {}'.format(function, name))
+        name = args[name]
+    if name in args:
+        position = args.index(name)
+        defaults = defaults or ()
+        first_default = len(args) - len(defaults)
+        default = (defaults[position - first_default]
+                   if position >= first_default else _MISSING)
+        return position, name, default
+    if keywords:
+        return None, name, _MISSING
+    raise TypeError('{} has no argument {!r}'.format(function, name))
@@ -0,0 +1,91 @@
+"""Deferred weaving of modules not imported yet.
+
+Pointcuts created with `lazy=True` don't import the modules of their
+joinpoints. The joinpoints are kept as pending and handled by an import hook
+when the module is imported for the first time.
+"""
+import sys
+from collections import defaultdict
+from importlib import import_module
+
+from .utils import import_lock, weaving
+
+__all__ = ['defer', 'cancel', 'get_module_name']
+
+
+def get_module_name(joinpoint):
+    """Returns the name of the module from a joinpoint string.
+
+    Returns `None` when the joinpoint contains only the class and the member
+    names.
+    """
+    parts = joinpoint.split('.')
+    if len(parts) < 3:
+        return None
+    return '.'.join(parts[:-2])
+
+
+class _LazyWeaver(object):
+    """Import hook running the pending callbacks after a module is imported.
+
+    It is in `sys.meta_path` only while some callback is pending and only
+    handles modules with pending callbacks, leaving the import itself to the
+    other finders.
+    """
+    def __init__(self):
+        self.pending = defaultdict(list)
+        self.loading = set()
+
+    def find_module(self, fullname, path=None):
+        if fullname in self.pending and fullname not in self.loading:
+            return self
+        return None
+
+    def load_module(self, fullname):
+        # Import the module as usual, without passing through this hook again
+        self.loading.add(fullname)
+        try:
+            module = import_module(fullname)
+        finally:
+            self.loading.discard(fullname)
+        with weaving():
+            callbacks = self.pending.pop(fullname, [])
+            _uninstall()
+            for callback, args in callbacks:
+                callback(*args)
+        return module
+
+
+_weaver = _LazyWeaver()
+
+
+def _uninstall():
+    """Removes the import hook if no callback is pending."""
+    if not _weaver.pending and _weaver in sys.meta_path:
+        sys.meta_path.remove(_weaver)
+
+
+def defer(module_name, callback, *args):
+    """Calls `callback` with `args` once `module_name` is imported.
+
+    The callback is called immediately if the module was already imported.
+    """
+    # The module can't be imported between the check and the handoff to the
+    # import hook
+    with import_lock():
+        if module_name not in sys.modules:
+            if _weaver not in sys.meta_path:
+                sys.meta_path.insert(0, _weaver)
+            _weaver.pending[module_name].append((callback, args))
+            return
+    callback(*args)
+
+
+def cancel(callback):
+    """Drops the pending calls to `callback`."""
+    for module_name, callbacks in _weaver.pending.items():
+        callbacks[:] = [(func, args) for func, args in callbacks
+                        if func != callback]
+        if not callbacks:
+            del _weaver.pending[module_name]
+    _uninstall()
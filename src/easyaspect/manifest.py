@@ -0,0 +1,215 @@
+"""Persistent cache of the members resolved from joinpoint patterns.
+
+Resolving a pattern like 'pkg.models.*.save*' lists and matches the members
+of every class in the module on each start. With a manifest, the members
+each pattern resolved to are saved in a file, along with the modification
+time, size and hash of the module files involved, including the modules of
+the base classes of the matched classes, and taken from it directly
+at the next start while those files don't change:
+
+    from easyaspect import manifest
+    manifest.use('/var/cache/app/easyaspect.json')
+
+    class LoggerAspect(Aspect):
+        ...
+
+The manifest is saved when the interpreter exits, or by `save`. Patterns
+without the module name, which depend on the calling module, and patterns
+matching classes not reachable from their module are always resolved.
+Members added to classes at run time by other code are not seen while the
+cache is valid.
+"""
+import atexit
+import hashlib
+import json
+import os
+import sys
+from inspect import getmro
+
+from .lazy import get_module_name
+from .utils import get_module
+
+__all__ = ['Manifest', 'use', 'save', 'resolve']
+
+
+def _get_source(module):
+    """Returns the source file of `module`, `None` if it has none."""
+    path = getattr(module, '__file__', None)
+    if not path:
+        return None
+    if path.endswith(('.pyc', '.pyo')):
+        path = path[:-1]
+    return os.path.abspath(path) if os.path.exists(path) else None
+
+
+def _hash(path):
+    with open(path, 'rb') as f:
+        return hashlib.md5(f.read()).hexdigest()
+
+
+class Manifest(object):
+    """Members resolved from patterns, saved in the JSON file `path`.
+
+    Each entry maps a pattern to the modules it depends on, as
+    `{module: [path, mtime, size, md5]}`, and to the resolved members, as
+    `[module, class, member]` lists.
+    """
+    def __init__(self, path):
+        self.path = path
+        self.entries = {}
+        self.changed = False
+        # Source file -> its mtime if it didn't change, `False` otherwise,
+        # checked once per process
+        self._checked = {}
+        # Source file -> md5, computed once per process
+        self._hashes = {}
+        try:
+            with open(path) as f:
+                self.entries = json.load(f)
+        except (IOError, ValueError):
+            pass
+
+    def resolve(self, joinpoint, kind, resolver):
+        """Returns the members matching `joinpoint` like `resolver` does, as
+        a list of `(class, [(name, member)])`.
+
+        `kind` tells the members returned by `resolver` apart, as 'methods'
+        or 'properties'.
+        """
+        if (not isinstance(joinpoint, basestring) or
+                not get_module_name(joinpoint)):
+            return resolver(joinpoint)
+        key = '{}:{}'.format(kind, joinpoint)
+        entry = self.entries.get(key)
+        if entry is not None and self._is_valid(entry):
+            members = self._load_members(entry)
+            if members is not None:
+                return members
+        members = resolver(joinpoint)
+        entry = self._make_entry(get_module_name(joinpoint), members)
+        if entry is not None:
+            self.entries[key] = entry
+            self.changed = True
+        elif self.entries.pop(key, None) is not None:
+            self.changed = True
+        return members
+
+    def _is_valid(self, entry):
+        """Returns if the modules of `entry` didn't change.
+
+        Modules touched without changing keep their new mtime in `entry`, so
+        they are hashed only once.
+        """
+        modules = entry['modules']
+        for name, (path, mtime, size, md5) in modules.items():
+            checked = self._checked.get(path)
+            if checked is None:
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    checked = False
+                else:
+                    # A file just touched or checked out again still has the
+                    # same contents
+                    if stat.st_size == size and (
+                            stat.st_mtime == mtime or
+                            self._hash(path) == md5):
+                        checked = stat.st_mtime
+                    else:
+                        checked = False
+                self._checked[path] = checked
+            if checked is False:
+                return False
+            if checked != mtime:
+                modules[name] = [path, checked, size, md5]
+                self.changed = True
+        return True
+
+    def _load_members(self, entry):
+        """Returns the members of `entry`, `None` if some is missing."""
+        members = []
+        for module_name, class_name, name in entry['members']:
+            # JSON strings are unicode
+            module_name, class_name, name = (
+                str(module_name), str(class_name), str(name))
+            module = sys.modules.get(module_name) or get_module(module_name)
+            cls = getattr(module, class_name, None)
+            if cls is None or not hasattr(cls, name):
+                return None
+            if not members or members[-1][0] is not cls:
+                members.append((cls, []))
+            members[-1][1].append((name, getattr(cls, name)))
+        return members
+
+    def _hash(self, path):
+        md5 = self._hashes.get(path)
+        if md5 is None:
+            md5 = self._hashes[path] = _hash(path)
+        return md5
+
+    def _make_entry(self, module_name, members):
+        """Returns the entry for `members` resolved from a pattern in the
+        module `module_name`, `None` if it can't be cached."""
+        modules = {}
+        names = set([module_name])
+        saved = []
+        for cls, attrs in members:
+            module = sys.modules.get(cls.__module__)
+            if getattr(module, cls.__name__, None) is not cls:
+                return None
+            # Inherited members come from the modules of the base classes
+            names.update(base.__module__ for base in getmro(cls)
+                         if base.__module__ not in sys.builtin_module_names)
+            saved += [[cls.__module__, cls.__name__, name]
+                      for name, _ in attrs]
+        for name in names:
+            path = _get_source(sys.modules.get(name))
+            if path is None:
+                return None
+            stat = os.stat(path)
+            modules[name] = [path, stat.st_mtime, stat.st_size,
+                             self._hash(path)]
+            self._checked[path] = stat.st_mtime
+        return {'modules': modules, 'members': saved}
+
+    def save(self):
+        """Writes the manifest, if it changed."""
+        if not self.changed:
+            return
+        # Replace the file at once, other processes may be reading it
+        temp_path = '{}.{}.tmp'.format(self.path, os.getpid())
+        with open(temp_path, 'w') as f:
+            json.dump(self.entries, f, sort_keys=True)
+        os.rename(temp_path, self.path)
+        self.changed = False
+
+
+# The manifest used by pointcuts, if any
+_manifest = [None]
+
+
+def use(path):
+    """Makes pointcuts use the manifest saved in `path`, creating it if it
+    doesn't exist.
+
+    Must be called before creating the aspects. The manifest is saved when
+    the interpreter exits.
+    """
+    if _manifest[0] is None:
+        atexit.register(save)
+    _manifest[0] = Manifest(path)
+    return _manifest[0]
+
+
+def save():
+    """Writes the manifest used by pointcuts, if any."""
+    if _manifest[0] is not None:
+        _manifest[0].save()
+
+
+def resolve(joinpoint, kind, resolver):
+    """Returns the members matching `joinpoint`, from the manifest used by
+    pointcuts or, if none, from `resolver`."""
+    if _manifest[0] is None:
+        return resolver(joinpoint)
+    return _manifest[0].resolve(joinpoint, kind, resolver)
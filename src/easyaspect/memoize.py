@@ -0,0 +1,206 @@
+"""Reusable aspect caching the values returned by advised functions.
+
+Subclass `MemoizeAspect` and define the `memoized` pointcut:
+
+    class ReadCache(MemoizeAspect):
+        memoized = Pointcut('Repository.read')
+        maxsize = 1000
+        ttl = 60
+
+Each advised function has its own cache, keeping at most `maxsize` values
+and evicting the least recently used, for at most `ttl` seconds if set.
+Values are cached per object and arguments or, with `per_instance = False`,
+per class of the object and arguments. Set `key` to a static method to
+compute the keys from the object and the arguments instead. Keys must be
+hashable.
+
+The keys reference the objects and the arguments, which stay alive while
+their values are cached, until evicted or invalidated. Use a `key` with
+something identifying the objects instead to let them go.
+
+Concurrent calls missing the same key wait for the first one to return
+instead of calling the function too.
+"""
+import sys
+import threading
+import weakref
+from collections import OrderedDict
+from timeit import default_timer as clock
+
+from .advice import around
+from .aspect import Aspect
+
+__all__ = ['Cache', 'MemoizeAspect']
+
+_MISSING = object()
+
+
+class _Call(object):
+    """Call in progress for a key, waited by concurrent misses."""
+    __slots__ = ('event', 'value', 'exc_info')
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.value = None
+        self.exc_info = None
+
+
+class Cache(object):
+    """LRU cache of at most `maxsize` values, expiring after `ttl` seconds
+    if set."""
+    def __init__(self, maxsize=128, ttl=None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        # key -> (value, expiration time), the least recently used first
+        self._values = OrderedDict()
+        # key -> call in progress
+        self._calls = {}
+        # Incremented by `invalidate`, so calls in progress don't store
+        # outdated values
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def get(self, key, func, *args, **kwargs):
+        """Returns the value cached for `key`, calling `func` with `args` and
+        `kwargs` on misses."""
+        with self._lock:
+            item = self._values.pop(key, _MISSING)
+            if item is not _MISSING:
+                if item[1] is None or clock() < item[1]:
+                    # Move to the end, as the most recently used
+                    self._values[key] = item
+                    self.hits += 1
+                    return item[0]
+                self.evictions += 1
+            self.misses += 1
+            call = self._calls.get(key)
+            if call is None:
+                call = self._calls[key] = _Call()
+                generation = self._generation
+            else:
+                generation = None
+        if generation is None:
+            call.event.wait()
+            if call.exc_info:
+                raise call.exc_info[0], call.exc_info[1], call.exc_info[2]
+            return call.value
+        try:
+            call.value = func(*args, **kwargs)
+        except BaseException:
+            call.exc_info = sys.exc_info()
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+                if call.exc_info is None and (
+                        generation == self._generation):
+                    self._put(key, call.value)
+            call.event.set()
+        return call.value
+
+    def _put(self, key, value):
+        expiration = clock() + self.ttl if self.ttl is not None else None
+        self._values[key] = (value, expiration)
+        while len(self._values) > self.maxsize:
+            self._values.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, key=_MISSING):
+        """Drops the value cached for `key` or, without `key`, all values."""
+        with self._lock:
+            self._generation += 1
+            if key is _MISSING:
+                self._values.clear()
+            else:
+                self._values.pop(key, None)
+
+    def info(self):
+        """Returns the hits, misses and evictions counters and the number of
+        cached values."""
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses,
+                    'evictions': self.evictions, 'size': len(self._values)}
+
+
+_caches_lock = threading.Lock()
+
+
+class MemoizeAspect(Aspect):
+    """Caches the values returned by the functions of the `memoized`
+    pointcut, see `easyaspect.memoize`."""
+    memoized = None
+    maxsize = 128
+    ttl = None
+    per_instance = True
+    key = None
+
+    @around('memoized')
+    def memoize(cls, joinpoint, next_, obj, *args, **kwargs):
+        return cls.get_cache(joinpoint).get(
+            cls.make_key(obj, *args, **kwargs), next_, obj, *args, **kwargs)
+
+    @classmethod
+    def make_key(cls, obj, *args, **kwargs):
+        """Returns the key of a call with `obj` and the arguments."""
+        if cls.key is not None:
+            return cls.key(obj, *args, **kwargs)
+        return (obj if cls.per_instance else obj.__class__, args,
+                frozenset(kwargs.items()) if kwargs else None)
+
+    @classmethod
+    def get_cache(cls, joinpoint):
+        """Returns the cache of `joinpoint`, the name passed to the advice,
+        see `JoinpointName`."""
+        # Names without class share a cache per aspect
+        owner = getattr(joinpoint, 'owner', None) or cls
+        cache = vars(cls).get('_caches', {}).get(owner, {}).get(joinpoint)
+        if cache is None:
+            with _caches_lock:
+                if '_caches' not in vars(cls):
+                    # Advised classes may be collected
+                    cls._caches = weakref.WeakKeyDictionary()
+                caches = cls._caches.setdefault(owner, {})
+                cache = caches.get(joinpoint)
+                if cache is None:
+                    cache = caches[joinpoint] = Cache(cls.maxsize, cls.ttl)
+        return cache
+
+    @classmethod
+    def _get_caches(cls):
+        """Returns `(owner, name, cache)` for each cache."""
+        return [(owner, name, cache)
+                for owner, caches in vars(cls).get('_caches', {}).items()
+                for name, cache in caches.items()]
+
+    @classmethod
+    def invalidate(cls, joinpoint=None, *args, **kwargs):
+        """Drops the values cached for `joinpoint` or, without `joinpoint`,
+        for all joinpoints.
+
+        `joinpoint` is the name passed to the advice, a label 'Class.name' or
+        a plain name, matching the functions with that name in all classes.
+        Given the object and the arguments of a call after `joinpoint`, only
+        the value of that call is dropped.
+        """
+        if joinpoint is None:
+            caches = [cache for _, _, cache in cls._get_caches()]
+        elif getattr(joinpoint, 'owner', None) is not None:
+            caches = [cls.get_cache(joinpoint)]
+        else:
+            caches = [cache for owner, name, cache in cls._get_caches()
+                      if joinpoint in (name, getattr(name, 'label', name))]
+        for cache in caches:
+            if args or kwargs:
+                cache.invalidate(cls.make_key(*args, **kwargs))
+            else:
+                cache.invalidate()
+
+    @classmethod
+    def counters(cls):
+        """Returns the counters of each cache by the label 'Class.name' of
+        its function, see `Cache.info`."""
+        return dict((getattr(name, 'label', name), cache.info())
+                    for _, name, cache in cls._get_caches())
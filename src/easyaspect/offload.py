@@ -0,0 +1,149 @@
+"""Reusable aspect running advised functions in thread or process pools.
+
+Requires `concurrent.futures`, installed by the `futures` package in
+Python 2. Subclass `OffloadAspect` and define the `offloaded` pointcut:
+
+    class ParallelModels(OffloadAspect):
+        offloaded = Pointcut('Model.compute')
+        pool = PROCESS
+        max_workers = 4
+
+Calls to the advised functions return a `concurrent.futures.Future`. The
+pool has `max_workers` workers and at most `max_pending` calls waiting or
+running, further calls block until one of them finishes. With `key` set to
+a static method computing a key from the object and the arguments, calls
+with the same key run in order, in the same worker.
+
+Process pools run the original function, without the advices, with copies
+of the object and the arguments, so changes to them are not seen by the
+caller. They are pickled once, in the calling thread, and passed to the
+executor already pickled, so calls with objects or arguments that can't be
+pickled are rejected with `TypeError` instead of failing in the feeder
+thread of the executor.
+"""
+import cPickle
+import threading
+
+from .advice import around
+from .aspect import Aspect
+from .pointcut import get_original
+
+try:
+    from concurrent import futures
+except ImportError:
+    futures = None
+
+__all__ = ['OffloadAspect', 'THREAD', 'PROCESS']
+
+THREAD = 'thread'
+PROCESS = 'process'
+
+POOLS = (THREAD, PROCESS)
+
+
+def _make_executor(pool, max_workers):
+    if futures is None:
+        raise ImportError('Offloading calls requires concurrent.futures, '
+                          'from the \'futures\' package')
+    if pool == PROCESS:
+        return futures.ProcessPoolExecutor(max_workers)
+    return futures.ThreadPoolExecutor(max_workers)
+
+
+def _call_original(call):
+    """Calls the original function `name` of `cls`, the class it was
+    advised in, from the pickled `(cls, name, obj, args, kwargs)`, in a
+    worker process."""
+    cls, name, obj, args, kwargs = cPickle.loads(call)
+    return get_original(getattr(cls, name))(obj, *args, **kwargs)
+
+
+class _Pool(object):
+    """Pool of `max_workers` workers with at most `max_pending` calls.
+
+    Pinned pools have one single worker executor per worker and choose it by
+    the key of the call.
+    """
+    def __init__(self, pool, max_workers, max_pending, pinned=False):
+        if pinned:
+            self.executors = [_make_executor(pool, 1)
+                              for i in range(max_workers)]
+        else:
+            self.executors = [_make_executor(pool, max_workers)]
+        self.semaphore = threading.BoundedSemaphore(max_pending)
+
+    def submit(self, key, func, *args, **kwargs):
+        """Runs `func` in the pool and returns its future."""
+        executor = self.executors[hash(key) % len(self.executors)]
+        semaphore = self.semaphore
+        semaphore.acquire()
+        try:
+            future = executor.submit(func, *args, **kwargs)
+        except BaseException:
+            semaphore.release()
+            raise
+        future.add_done_callback(lambda future: semaphore.release())
+        return future
+
+    def shutdown(self, wait=True):
+        for executor in self.executors:
+            executor.shutdown(wait)
+
+
+_pools_lock = threading.Lock()
+
+
+class OffloadAspect(Aspect):
+    """Runs the functions of the `offloaded` pointcut in a pool, see
+    `easyaspect.offload`."""
+    offloaded = None
+    pool = THREAD
+    max_workers = 4
+    max_pending = 100
+    key = None
+
+    @around('offloaded')
+    def offload(cls, joinpoint, next_, obj, *args, **kwargs):
+        pool = cls.get_pool()
+        key = cls.key(obj, *args, **kwargs) if cls.key is not None else None
+        if cls.pool == PROCESS:
+            # Found from the class it was advised in, not from the class of
+            # the object, which may override it and call it with `super`
+            owner = joinpoint.owner or obj.__class__
+            try:
+                call = cPickle.dumps(
+                    (owner, str(joinpoint), obj, args, kwargs),
+                    cPickle.HIGHEST_PROTOCOL)
+            except Exception as e:
+                raise TypeError(
+                    'Can\'t run \'{}\' in a process pool, the object or the '
+                    'arguments can\'t be pickled: {}'.format(joinpoint, e))
+            return pool.submit(key, _call_original, call)
+        return pool.submit(key, next_, obj, *args, **kwargs)
+
+    @classmethod
+    def get_pool(cls):
+        """Returns the pool of the aspect, creating it on the first call."""
+        pool = vars(cls).get('_pool')
+        if pool is None:
+            if cls.pool not in POOLS:
+                raise ValueError(
+                    '\'pool\' must be one of {} but got {}'.format(
+                        ', '.join(POOLS), cls.pool))
+            with _pools_lock:
+                pool = vars(cls).get('_pool')
+                if pool is None:
+                    pool = cls._pool = _Pool(
+                        cls.pool, cls.max_workers, cls.max_pending,
+                        cls.key is not None)
+        return pool
+
+    @classmethod
+    def shutdown(cls, wait=True):
+        """Stops the pool after the pending calls. A new pool is created by
+        the next call."""
+        with _pools_lock:
+            pool = vars(cls).get('_pool')
+            cls._pool = None
+        if pool is not None:
+            pool.shutdown(wait)
@@ -1,12 +1,22 @@
 # TODO: create a prefix to be used by all attributes injected into functions
 import fnmatch
+import sys
+import weakref
 from collections import defaultdict, Iterable
-from functools import wraps
-from inspect import ismethod
+from functools import update_wrapper, wraps
+from inspect import getmro, isgeneratorfunction, ismethod
 
-from .utils import get_members, get_methods, get_properties
+from . import coroutine, manifest
+from .binding import Binder
+from .descriptor import AdvisedAttribute
+from .lazy import cancel, defer, get_module_name
+from .specialize import get_signature
+from .stats import ADVICES, CALLS, FUNCTION, Stats
+from .utils import (get_members, get_methods, get_properties, weaving,
+                    weaving_lock)
 
-__all__ = ['Pointcut', 'reset', 'get_original']
+__all__ = ['Pointcut', 'JoinpointName', 'reset', 'unweave_all',
+           'get_original']
 
 ALL = 'all'
 PROPERTIES = 'properties'
@@ -14,177 +24,824 @@ METHODS = 'methods'
 
 DEFAULT_TARGET = ALL
 
+# Accesses to advised attributes
+GET = 'get'
+SET = 'set'
+
 INTERNAL_PROPS = []
 
 
+def _synchronized(func):
+    """Decorator serializing calls to functions changing the weaving state.
+
+    The changes are published by replacing objects, advised functions read
+    them without locks.
+    """
+    @wraps(func)
+    def synchronized(*args, **kwargs):
+        with weaving_lock:
+            return func(*args, **kwargs)
+    return synchronized
+
+
+def _weaving_pass(func):
+    """Decorator running functions that may import modules in a weaving pass,
+    which also serializes them."""
+    @wraps(func)
+    def in_weaving_pass(*args, **kwargs):
+        with weaving():
+            return func(*args, **kwargs)
+    return in_weaving_pass
+
+
+class JoinpointName(str):
+    """Name of an advised function, passed to the advices.
+
+    It is the plain name of the function, also telling the class `owner` the
+    function was advised in, `None` if it is gone or there is none, and the
+    `label` 'Class.name' used by the stats. Functions with the same name in
+    different classes have equal names, so state kept per advised function
+    must also use `owner`.
+    """
+    def __new__(cls, name, owner=None):
+        self = str.__new__(cls, name)
+        # Don't keep dynamically created classes alive
+        self._owner = weakref.ref(owner) if owner is not None else None
+        self.label = '{}.{}'.format(owner.__name__, name) if owner else name
+        return self
+
+    @property
+    def owner(self):
+        return self._owner and self._owner()
+
+    def __reduce__(self):
+        # Pickled as the plain name, the class isn't needed to find it
+        return str, (str(self),)
+
+
 class Pointcut(object):
-    def __init__(self, joinpoints=[], target=DEFAULT_TARGET):
+    """Set of joinpoints where advices are executed.
+
+    With `specialize=True` the advised functions created by this pointcut are
+    generated with the same signature of the original functions, avoiding to
+    repack the arguments on each call. Arguments passed by keyword are then
+    passed to advices by position when they match a named argument.
+
+    Disabling the pointcut with `swap=True` puts the original functions back
+    in the classes, as long as all pointcuts sharing them are disabled too, so
+    disabled advices cost nothing. Enabling the pointcut puts the advised
+    versions back.
+
+    With `lazy=True` joinpoints from modules not imported yet are handled
+    only when the module is imported, instead of importing it immediately.
+
+    Generator functions are advised as coroutines, see `easyaspect.coroutine`.
+
+    Joinpoints can also be expressions combining patterns, see
+    `easyaspect.expression`.
+
+    Attributes are replaced by an `AdvisedAttribute` and advised when written
+    or, according to `access`, when read (`GET`) or both (`ALL`). Advices of
+    reads receive the object only, advices of writes receive the object and
+    the value.
+
+    The advised classes are referenced weakly, so classes created dynamically
+    can be collected while advised. `unweave` puts back the original
+    attributes replaced by the pointcut, see also `unweave_all`.
+    """
+    __slots__ = ('name', 'aspect', 'target', 'specialize', 'lazy', 'access',
+                 'instrumented', 'enabled', 'scope', '_stats', '__advices',
+                 '_disabled_advices', '_snapshot', '_sites', '__weakref__')
+
+    def __init__(self, joinpoints=[], target=DEFAULT_TARGET,
+                 specialize=False, lazy=False, access=SET):
         self.name = None
+        self.aspect = None
         self.target = target or DEFAULT_TARGET
+        self.specialize = specialize
+        self.lazy = lazy
+        self.access = access
+        self.instrumented = False
+        self._stats = None
+        # Scope where the advices are active, see `easyaspect.scope`
+        self.scope = None
         self.__advices = defaultdict(list)
+        self._snapshot = None
+        # Attributes replaced, see `_Sites`
+        self._sites = _Sites()
+        _all_pointcuts.add(self)
         self.enable()
         # The class accepts one joinpoint without a list, but works only with
         # a list of joinpoints
         if not isinstance(joinpoints, Iterable) or isinstance(
                 joinpoints, basestring):
             joinpoints = [joinpoints]
-        for joinpoint in joinpoints:
-            self._handle_joinpoint(joinpoint)
+        with weaving():
+            for joinpoint in joinpoints:
+                self._handle_joinpoint(joinpoint)
 
     def get_advices(self):
-        """Returns the enabled advices."""
-        if not self.enabled:
-            return {'before': [], 'around': [], 'after': []}
-        return {
-            'before': [advice for advice in self.__advices['before'] if
-                       not advice.name in self._disabled_advices],
-            'around': [advice for advice in self.__advices['around'] if
-                       not advice.name in self._disabled_advices],
-            'after': [advice for advice in self.__advices['after'] if
-                      not advice.name in self._disabled_advices]
-        }
+        """Returns the enabled advices.
+
+        The returned dictionary is a snapshot shared by all callers until the
+        advices change, so it must not be modified.
+        """
+        return self._snapshot
 
     advices = property(get_advices)
 
+    @_synchronized
     def add_advice(self, advice):
         """Adds an advice associated with some joinpoint of this pointcut."""
         if not advice in self.__advices[advice.type]:
             self.__advices[advice.type].append(advice)
+            self._changed()
 
+    @_synchronized
     def enable(self):
-        self._disabled_advices = []
+        self._disabled_advices = set()
         self.enabled = True
+        # Put back the advised versions swapped out by `disable`
+        for cls, name, member in self._sites:
+            joinpoint = _get_joinpoint(member)
+            if joinpoint.swapped is not None:
+                setattr(cls, name, joinpoint.swapped)
+                joinpoint.swapped = None
+            self._sites.release(cls, name)
+        self._changed()
 
-    def disable(self, advice_name=None):
+    @_synchronized
+    def disable(self, advice_name=None, swap=False):
         if advice_name:
-            self._disabled_advices.append(advice_name)
+            self._disabled_advices.add(advice_name)
         else:
             # TODO: disable all advices instead of disable the pointcut itself
             self.enabled = False
+            if swap:
+                self._swap_out()
+        self._changed()
+
+    @_synchronized
+    def set_scope(self, scope):
+        """Makes the advices run only while `scope` is active, or always if
+        `scope` is `None`."""
+        self.scope = scope
+        self._changed()
+
+    @_synchronized
+    def instrument(self, enabled=True):
+        """Starts or stops recording call counts and times.
+
+        The recorded values are kept while not recording and are returned by
+        `stats`.
+        """
+        self.instrumented = enabled
+        if enabled and self._stats is None:
+            self._stats = Stats()
+        self._changed()
+
+    def stats(self):
+        """Returns the call counts and times recorded by `instrument`."""
+        return self._stats.snapshot() if self._stats else {}
+
+    def _swap_out(self):
+        """Puts back the original functions replaced by this pointcut when
+        no other pointcut sharing them is enabled."""
+        for cls, name, member in self._sites:
+            joinpoint = _get_joinpoint(member)
+            current = _get_own(cls, name)
+            if (joinpoint.swapped is not None or
+                    _get_joinpoint(current) is not joinpoint or
+                    any(pointcut.enabled for pointcut in joinpoint.pointcuts)):
+                continue
+            joinpoint.swapped = current
+            self._sites.keep(cls, name, current)
+            _put_back(cls, name, joinpoint)
+
+    @_synchronized
+    def unweave(self):
+        """Removes the pointcut from its joinpoints, putting back the original
+        attributes no longer advised by other pointcuts.
 
+        Joinpoints waiting for their module to be imported are dropped.
+        """
+        cancel(self._handle_joinpoint)
+        sites, self._sites = self._sites, _Sites()
+        attributes = set()
+        for cls, name, member in sites:
+            joinpoint = _get_joinpoint(member)
+            joinpoint.pointcuts = tuple(
+                pointcut for pointcut in joinpoint.pointcuts
+                if pointcut is not self)
+            if joinpoint.pointcuts:
+                continue
+            swapped, joinpoint.swapped = joinpoint.swapped, None
+            if isinstance(cls, AdvisedAttribute):
+                setattr(cls, name, None)
+                attributes.add(cls)
+            elif swapped is None and _get_own(cls, name) is member:
+                _put_back(cls, name, joinpoint)
+        for attribute in attributes:
+            attribute.restore()
+        _invalidate()
+
+    def _changed(self):
+        """Publishes a new advices snapshot and outdates the advice chains.
+
+        The snapshot is replaced before changing the version, so chains
+        compiled for the new version always see it.
+        """
+        if not self.enabled:
+            snapshot = {'before': [], 'around': [], 'after': []}
+        else:
+            snapshot = dict(
+                (type, [advice for advice in self.__advices[type] if
+                        not advice.name in self._disabled_advices])
+                for type in ('before', 'around', 'after'))
+        self._snapshot = snapshot
+        _invalidate()
+
+    @_weaving_pass
     def _handle_joinpoint(self, joinpoint):
+        if self.lazy and isinstance(joinpoint, basestring):
+            module_name = get_module_name(joinpoint)
+            if module_name and module_name not in sys.modules:
+                defer(module_name, self._handle_joinpoint, joinpoint)
+                return
         # Handle methods
         if self.target in (ALL, METHODS):
-            for cls, funcs in get_methods(joinpoint):
+            for cls, funcs in manifest.resolve(joinpoint, METHODS,
+                                               get_methods):
                 for name, func in funcs:
                     # Replace the original function with the wrapped version
-                    setattr(cls, name, self.wrap(func, name))
+                    advised_func = self.wrap(func, name)
+                    setattr(cls, name, advised_func)
+                    self._sites.add(cls, name, advised_func)
         # Handle properties
         if self.target in (ALL, PROPERTIES):
-            for cls, props in get_properties(joinpoint):
+            accessors = []
+            if self.access in (ALL, GET):
+                accessors.append(('fget', 'get'))
+            if self.access in (ALL, SET):
+                accessors.append(('fset', 'set'))
+            for cls, props in manifest.resolve(joinpoint, PROPERTIES,
+                                               get_properties):
                 for name, prop in props:
                     # Ignore internal properties
-                    if (not fnmatch.fnmatch(name, '__*__') and
-                            not name.startswith('__advised_prop_') and
-                            not name in INTERNAL_PROPS):
-                        # Create `property` object if needed
-                        if not isinstance(prop, property):
-                            advised_prop_name = '__advised_prop_{}'.format(
-                                name)
-                            setattr(cls, advised_prop_name, prop)
-
-                            # Using a factory function to set the correct name
-                            def create_prop(name):
-                                return property(
-                                    lambda self: getattr(self, name),
-                                    lambda self, value:
-                                    setattr(self, name, value))
-                            prop = create_prop(advised_prop_name)
-                            setattr(cls, name, prop)
-                        # Create a new property using the wrapped setter
-                        # function
-                        prop = prop.setter(self.wrap(prop.fset, name))
+                    if (fnmatch.fnmatch(name, '__*__') or
+                            name in INTERNAL_PROPS):
+                        continue
+                    if not isinstance(prop, AdvisedAttribute):
+                        prop = AdvisedAttribute(name, prop, cls)
                         setattr(cls, name, prop)
+                    for advised, original in accessors:
+                        func = getattr(prop, advised) or getattr(
+                            prop, original)
+                        # Read only or write only attribute
+                        if func is None:
+                            continue
+                        advised_func = self.wrap(func, name, cls)
+                        setattr(prop, advised, advised_func)
+                        self._sites.add(prop, advised, advised_func)
+
+    @_synchronized
+    def wrap(self, func, name=None, owner=None):
+        """Wraps the original function to run advices.
 
-    def wrap(self, func, name=None):
-        """Wraps the original function to run advices."""
+        `owner` is the class of functions that aren't methods, like the
+        accessors of attributes.
+        """
         name = name or func.__name__
         cls = getattr(func, 'im_class', None)
-        # Avoid to wrap an already wrapped function
-        if hasattr(func, '_orig_func'):
+        # Work with the plain function instead of the (un)bound method
+        func = getattr(func, 'im_func', func)
+        # The function is inherited when the class doesn't define it itself
+        inherited = cls is not None and name not in vars(cls)
+        joinpoint = getattr(func, '_joinpoint', None)
+        # Avoid to wrap an already wrapped function. An advised function
+        # inherited from a parent class gets its own wrapper instead, around
+        # the original function.
+        if joinpoint and not inherited:
             advised_func = func
         else:
-            _pointcuts = []  # We use the fact that lists are mutable
+            if joinpoint:
+                func = joinpoint.func
+            name = JoinpointName(name, cls or owner)
+            joinpoint = _Joinpoint(func, name, inherited, self.specialize)
+            # Name used by the stats
+            joinpoint.label = name.label
+            advised_func = joinpoint.create_advised_func()
+        # Overlapping joinpoints resolve to the same function
+        if self in joinpoint.pointcuts:
+            return advised_func
+        # Replace the tuple instead of changing it, see `_synchronized`
+        joinpoint.pointcuts += (self,)
+        _invalidate()
+        return advised_func
+
+
+class _Sites(object):
+    """Weak registry of the attributes replaced by a pointcut.
+
+    Iterating over it yields `(class, name, advised member)` for each
+    attribute of the classes still alive. For attributes advised through an
+    `AdvisedAttribute` the descriptor and the accessor name are used instead
+    of the class and the attribute name.
+
+    The advised members are referenced weakly too, as they may reference
+    their class, except while swapped out of it.
+    """
+    __slots__ = ('_sites',)
+
+    def __init__(self):
+        # id(class) -> (weak reference to class, {name: weak reference to
+        # advised member}, {name: advised member swapped out})
+        self._sites = {}
+
+    def _get(self, cls):
+        key = id(cls)
+        site = self._sites.get(key)
+        if site is None:
+            sites = self._sites
+            ref = weakref.ref(cls, lambda ref: sites.pop(key, None))
+            site = sites[key] = (ref, {}, {})
+        return site
+
+    def add(self, cls, name, member):
+        self._get(cls)[1][name] = weakref.ref(member)
+
+    def keep(self, cls, name, member):
+        """Keeps the advised member swapped out of `cls` alive."""
+        self._get(cls)[2][name] = member
+
+    def release(self, cls, name):
+        """Forgets the member kept by `keep`."""
+        self._get(cls)[2].pop(name, None)
+
+    def __iter__(self):
+        for ref, members, kept in self._sites.values():
+            cls = ref()
+            if cls is None:
+                continue
+            for name, member_ref in members.items():
+                member = kept.get(name) or member_ref()
+                if member is not None:
+                    yield cls, name, member
+
+    def __len__(self):
+        return len(self._sites)
+
+
+class _Joinpoint(object):
+    """Internal class holding the state of an advised function.
+
+    The advices of all pointcuts attached to the function are precompiled
+    into a single callable, the chain, which is rebuilt only when the global
+    version changes (see `_invalidate`). Inherited advised functions keep one
+    chain per class of the objects they are called with, since the parent
+    pointcuts depend on the class.
+
+    The advised function references only its joinpoint, in `_joinpoint`.
+    """
+    __slots__ = ('func', 'name', 'label', 'inherited', 'coroutine',
+                 'signature', 'binder', 'pointcuts', 'swapped', 'chain',
+                 'chains')
+
+    def __init__(self, func, name, inherited=False, specialize=False):
+        self.func = func
+        self.name = name
+        self.label = name
+        self.inherited = inherited
+        # Generator based coroutines get a generator chain
+        self.coroutine = isgeneratorfunction(func)
+        self.signature = get_signature(func) if (
+            specialize and not self.coroutine) else None
+        if self.signature and inherited and (
+                'inherited_wrapper' not in self.signature.codes):
+            self.signature = None
+        # Created for the first advice receiving bound arguments
+        self.binder = None
+        self.pointcuts = ()
+        # The advised member while the original one is swapped in
+        self.swapped = None
+        # (version, compiled callable)
+        self.chain = (None, None)
+        # id(class) -> (weak reference to class, version, compiled callable)
+        self.chains = {}
+
+    def compile(self, parent=None):
+        """Returns the chain using the pointcuts from this joinpoint and from
+        the `parent` joinpoint, if any."""
+        pointcuts = list(parent.pointcuts) if parent else []
+        pointcuts += self.pointcuts
+        return _compile_chain(self, pointcuts)
+
+    def get_binder(self):
+        """Returns the `Binder` of the function, shared by its chains."""
+        if self.binder is None:
+            self.binder = Binder(self.func)
+        return self.binder
+
+    def update_chain(self):
+        """Rebuilds the chain used by not inherited advised functions."""
+        version = _version[0]
+        call = self.compile()
+        self.chain = (version, call)
+        return call
+
+    def update_class_chain(self, cls):
+        """Rebuilds the chain used when called with an instance of `cls`."""
+        version = _version[0]
+        call = self.compile(_get_parent_joinpoint(cls, self.name))
+        key = id(cls)
+        chains = self.chains
+        # Don't keep the class alive, dynamically created classes may be
+        # discarded at any time
+        ref = weakref.ref(cls, lambda ref: chains.pop(key, None))
+        chains[key] = (ref, version, call)
+        return call
 
-            @wraps(func)
+    def create_advised_func(self):
+        """Creates the function that replaces the original one."""
+        joinpoint = self
+
+        if self.signature:
+            namespace = {'_ea_joinpoint': self, '_ea_current': _version,
+                         '_ea_chains': self.chains, '_ea_id': id}
+            if self.inherited:
+                advised_func = self.signature.make('inherited_wrapper',
+                                                   namespace)
+            else:
+                advised_func = self.signature.make('wrapper', namespace)
+            update_wrapper(advised_func, self.func)
+        elif self.inherited:
+            chains = self.chains
+
+            @wraps(self.func)
+            def advised_func(*args, **kwargs):
+                # Pointcuts from parent classes are resolved once per class
+                cls = args[0].__class__
+                chain = chains.get(id(cls))
+                if chain is None or chain[1] != _version[0]:
+                    call = joinpoint.update_class_chain(cls)
+                else:
+                    call = chain[2]
+                return call(*args, **kwargs)
+        else:
+            @wraps(self.func)
             def advised_func(*args, **kwargs):
-                pointcuts = []
-                obj = args[0]
-
-                # Get pointcuts from parent classes only if the class doesn't
-                # overrided the method
-                cls = type(obj)
-                if hasattr(getattr(cls, name), '_created_by_aspect'):
-                    for cls in type.mro(type(obj))[1:]:
-                        if not hasattr(getattr(cls, name),
-                                       '_created_by_aspect'):
-                            parent_cls_func = getattr(cls, name, None)
-                            if isinstance(parent_cls_func, property):
-                                parent_cls_func = parent_cls_func.fset
-                            if parent_cls_func and hasattr(
-                                    parent_cls_func, '_pointcuts'):
-                                pointcuts += parent_cls_func._pointcuts
-                            break
-                pointcuts += _pointcuts
-
-                # Create function to be passed to 'around' advice
-                def create_advised_func(func_, next_):
-                    def _func(*args, **kwargs):
-                        return func_(pointcut.aspect, name, next_,
-                                     *args, **kwargs)
-                    return _func
-
-                # Wrap the original function with 'before' and 'after'
-                # advices
-                def advised(*args, **kwargs):
-                    # Execute 'before' advices
-                    for pointcut in pointcuts:
-                        for before in pointcut.advices['before']:
-                            before(pointcut.aspect, name, *args, **kwargs)
-                    ret = func(*args, **kwargs)
-                    # Execute 'after' advices
-                    for pointcut in pointcuts:
-                        for after in pointcut.advices['after']:
-                            after(pointcut.aspect, name, *args, **kwargs)
-                    return ret
-
-                # Execute 'around' advices
-                for pointcut in pointcuts:
-                    for advice in pointcut.advices['around']:
-                        advised = create_advised_func(advice, advised)
-                ret = advised(*args, **kwargs)
-                return ret
-
-            # Save reference to original function
-            advised_func._orig_func = func
-            # Save reference to point cuts list
-            advised_func._pointcuts = _pointcuts
-        # This is the same `_pointcuts` list defined above
-        advised_func._pointcuts.append(self)
-        if cls and not name in vars(cls):
-            advised_func._created_by_aspect = True
+                version, call = joinpoint.chain
+                if version != _version[0]:
+                    call = joinpoint.update_chain()
+                return call(*args, **kwargs)
+
+        advised_func._joinpoint = self
         return advised_func
 
 
+# Incremented every time something that affects the advice chains changes
+_version = [0]
+
+# All pointcuts, each one indexing the attributes it replaced
+_all_pointcuts = weakref.WeakSet()
+
+
+def _invalidate():
+    """Marks all precompiled advice chains as outdated."""
+    _version[0] += 1
+
+
+def _get_joinpoint(member):
+    """Returns the joinpoint of an advised function."""
+    return getattr(member, '_joinpoint', None)
+
+
+def _is_inherited(member):
+    """Returns if `member` is an advised function created for a class
+    inheriting it."""
+    joinpoint = _get_joinpoint(member)
+    return joinpoint is not None and joinpoint.inherited
+
+
+def _put_back(cls, name, joinpoint):
+    """Puts back the original attribute replaced by the advised function of
+    `joinpoint`."""
+    if joinpoint.inherited:
+        # The class didn't define the function, let it inherit again
+        delattr(cls, name)
+    elif isinstance(cls, AdvisedAttribute):
+        # Not advised accessors are skipped by the attribute
+        setattr(cls, name, None)
+    else:
+        setattr(cls, name, joinpoint.func)
+
+
+def _get_own(cls, name):
+    """Returns the attribute `name` defined by `cls` itself or, for an
+    `AdvisedAttribute`, its accessor `name`."""
+    if isinstance(cls, AdvisedAttribute):
+        return getattr(cls, name)
+    return vars(cls).get(name)
+
+
+def _get_parent_joinpoint(cls, name):
+    """Returns the joinpoint of the first class in `cls` MRO not using an
+    inherited advised function.
+
+    Get pointcuts from parent classes only if the class doesn't overrided the
+    method.
+    """
+    if not _is_inherited(getattr(cls, name, None)):
+        return None
+    for parent_cls in getmro(cls)[1:]:
+        parent_cls_func = getattr(parent_cls, name, None)
+        if not _is_inherited(parent_cls_func):
+            return _get_joinpoint(parent_cls_func)
+    return None
+
+
+def _make_around(advice, aspect, name, next_, signature=None):
+    """Creates the function to be passed to 'around' advices."""
+    if signature:
+        return signature.make('around', {
+            '_ea_advice': advice, '_ea_aspect': aspect, '_ea_name': name,
+            '_ea_next': next_})
+
+    def _func(*args, **kwargs):
+        return advice(aspect, name, next_, *args, **kwargs)
+    return _func
+
+
+def _get_advices(pointcut, type, joinpoint, background=False,
+                 gate_scope=False, with_bind=False):
+    """Returns `(function, aspect)` tuples for the `pointcut` advices of
+    `joinpoint` running in the caller thread or, with `background=True`, in a
+    worker.
+
+    With `gate_scope=True` the advices of scoped pointcuts check the scope on
+    each call. With `with_bind=True` the tuples also tell if the advice
+    receives bound arguments.
+    """
+    aspect, label = pointcut.aspect, joinpoint.label
+    advices = []
+    for advice in pointcut.advices[type]:
+        if bool(advice.background) != background:
+            continue
+        func = advice.func
+        if pointcut.instrumented:
+            func = pointcut._stats.timed(func, (label, ADVICES, advice.name))
+        if background:
+            func = advice.background.wrap(func)
+        # Decide if the advice runs before calling it
+        if advice.sample is not None:
+            func = advice.sample.gate(func, type == 'around',
+                                      (advice, joinpoint))
+        if advice.guard is not None:
+            func = advice.guard.gate(func, joinpoint.func, type == 'around',
+                                     background, advice.bind)
+        if gate_scope and pointcut.scope is not None:
+            func = pointcut.scope.gate(func, type == 'around')
+        if with_bind:
+            advices.append((func, aspect, advice.bind))
+        else:
+            advices.append((func, aspect))
+    return advices
+
+
+def _compile_chain(joinpoint, pointcuts):
+    """Precompiles the advices from `pointcuts` into a single callable.
+
+    If the scoped pointcuts share the same scope, two chains are compiled and
+    the scope chooses one on each call. Otherwise each scoped advice checks
+    its own scope.
+    """
+    unique = []
+    for pointcut in pointcuts:
+        # The same pointcut may be reached through a parent class
+        if not pointcut in unique:
+            unique.append(pointcut)
+    scopes = set(pointcut.scope for pointcut in unique
+                 if pointcut.scope is not None)
+    if len(scopes) == 1:
+        return scopes.pop().dispatch(
+            _compile_advices(joinpoint, unique),
+            _compile_advices(joinpoint, [pointcut for pointcut in unique
+                                         if pointcut.scope is None]))
+    return _compile_advices(joinpoint, unique, bool(scopes))
+
+
+def _compile_advices(joinpoint, pointcuts, gate_scope=False):
+    """Precompiles the advices from `pointcuts` around the joinpoint
+    function."""
+    if any(advice.bind for pointcut in pointcuts
+           for advices in pointcut.advices.values() for advice in advices):
+        return _compile_bound_advices(joinpoint, pointcuts, gate_scope)
+    func, name, label = joinpoint.func, joinpoint.name, joinpoint.label
+    befores, arounds, afters, returnings = [], [], [], []
+    collectors = []
+    for pointcut in pointcuts:
+        if pointcut.instrumented:
+            collectors.append(pointcut._stats)
+        befores += _get_advices(pointcut, 'before', joinpoint,
+                                gate_scope=gate_scope)
+        arounds += _get_advices(pointcut, 'around', joinpoint,
+                                gate_scope=gate_scope)
+        afters += _get_advices(pointcut, 'after', joinpoint,
+                               gate_scope=gate_scope)
+        # Background advices also receive the returned value
+        returnings += _get_advices(pointcut, 'after', joinpoint, True,
+                                   gate_scope)
+    befores, afters = tuple(befores), tuple(afters)
+    returnings = tuple(returnings)
+    has_advices = befores or afters or returnings
+    # Instrumented chains use the generic functions
+    signature = None if collectors else joinpoint.signature
+    # Timing a coroutine call would measure only the generator creation
+    if joinpoint.coroutine:
+        collectors = []
+    for stats in collectors:
+        func = stats.timed(func, (label, FUNCTION, None))
+
+    if has_advices and joinpoint.coroutine:
+        call = coroutine.make_call(func, name, befores, afters, returnings)
+    elif has_advices and signature:
+        call = signature.make('call', {
+            '_ea_befores': befores, '_ea_afters': afters,
+            '_ea_returnings': returnings, '_ea_name': name, '_ea_func': func})
+    elif has_advices:
+        # Wrap the original function with 'before' and 'after' advices
+        def call(*args, **kwargs):
+            # Execute 'before' advices
+            for before, aspect in befores:
+                before(aspect, name, *args, **kwargs)
+            ret = func(*args, **kwargs)
+            # Execute 'after' advices
+            for after, aspect in afters:
+                after(aspect, name, *args, **kwargs)
+            for after, aspect in returnings:
+                after(aspect, name, ret, *args, **kwargs)
+            return ret
+    else:
+        call = func
+    # Stack 'around' advices, the last one being the outermost
+    for around, aspect in arounds:
+        call = _make_around(around, aspect, name, call, signature)
+    for stats in collectors:
+        call = stats.timed(call, (label, CALLS, None))
+    return call
+
+
+def _compile_bound_advices(joinpoint, pointcuts, gate_scope=False):
+    """Precompiles the advices from `pointcuts`, some receiving the bound
+    arguments, around the joinpoint function.
+
+    The layers of the chain pass the bound arguments down with the
+    arguments, as `(arguments, args, kwargs)`, so they are bound at most once
+    per call, when the first bound advice runs. Layers below an 'around'
+    advice passing new arguments bind them again.
+    """
+    func, name, label = joinpoint.func, joinpoint.name, joinpoint.label
+    binder = joinpoint.get_binder()
+    bind = binder.bind
+    befores, arounds, afters, returnings = [], [], [], []
+    collectors = []
+    for pointcut in pointcuts:
+        if pointcut.instrumented:
+            collectors.append(pointcut._stats)
+        befores += _get_advices(pointcut, 'before', joinpoint,
+                                gate_scope=gate_scope, with_bind=True)
+        arounds += _get_advices(pointcut, 'around', joinpoint,
+                                gate_scope=gate_scope, with_bind=True)
+        afters += _get_advices(pointcut, 'after', joinpoint,
+                               gate_scope=gate_scope, with_bind=True)
+        returnings += _get_advices(pointcut, 'after', joinpoint, True,
+                                   gate_scope, True)
+    befores, afters = tuple(befores), tuple(afters)
+    returnings = tuple(returnings)
+    if joinpoint.coroutine:
+        collectors = []
+    for stats in collectors:
+        func = stats.timed(func, (label, FUNCTION, None))
+
+    if joinpoint.coroutine:
+        # The steps of coroutines can't share the arguments, each bound
+        # advice binds them
+        call = coroutine.make_call(
+            func, name, *[[(_bind_each(advice, bind) if bound else advice,
+                            aspect) for advice, aspect, bound in advices]
+                          for advices in (befores, afters, returnings)])
+        call = _unbound_layer(call)
+    elif befores or afters or returnings:
+        def call(arguments, args, kwargs):
+            for before, aspect, bound in befores:
+                if not bound:
+                    before(aspect, name, *args, **kwargs)
+                    continue
+                if arguments is None:
+                    arguments = bind(*args, **kwargs)
+                before(aspect, name, arguments)
+            ret = func(*args, **kwargs)
+            for after, aspect, bound in afters:
+                if not bound:
+                    after(aspect, name, *args, **kwargs)
+                    continue
+                if arguments is None:
+                    arguments = bind(*args, **kwargs)
+                after(aspect, name, arguments)
+            for after, aspect, bound in returnings:
+                if not bound:
+                    after(aspect, name, ret, *args, **kwargs)
+                    continue
+                if arguments is None:
+                    arguments = bind(*args, **kwargs)
+                after(aspect, name, ret, arguments)
+            return ret
+    else:
+        call = _unbound_layer(func)
+    for around, aspect, bound in arounds:
+        if bound:
+            call = _make_bound_around(around, aspect, name, call, binder)
+        else:
+            call = _make_unbound_around(around, aspect, name, call)
+
+    def entry(*args, **kwargs):
+        return call(None, args, kwargs)
+    for stats in collectors:
+        entry = stats.timed(entry, (label, CALLS, None))
+    return entry
+
+
+def _bind_each(advice, bind):
+    """Returns a function binding the arguments for `advice` alone."""
+    def _func(aspect, name, *args, **kwargs):
+        return advice(aspect, name, bind(*args, **kwargs))
+    return _func
+
+
+def _unbound_layer(func):
+    """Returns a layer of a bound chain calling `func` with the
+    arguments."""
+    def _func(arguments, args, kwargs):
+        return func(*args, **kwargs)
+    return _func
+
+
+def _make_bound_around(advice, aspect, name, next_, binder):
+    """Creates the layer of a bound chain running the 'around' `advice`
+    with bound arguments."""
+    bind, unbind = binder.bind, binder.unbind
+
+    def _func(arguments, args, kwargs):
+        if arguments is None:
+            arguments = bind(*args, **kwargs)
+
+        def proceed(new_arguments):
+            if new_arguments is arguments:
+                return next_(arguments, args, kwargs)
+            new_args, new_kwargs = unbind(new_arguments)
+            return next_(new_arguments, new_args, new_kwargs)
+        return advice(aspect, name, proceed, arguments)
+    return _func
+
+
+def _make_unbound_around(advice, aspect, name, next_):
+    """Creates the layer of a bound chain running the 'around' `advice`
+    with the plain arguments."""
+    def proceed(*args, **kwargs):
+        # The arguments may have changed
+        return next_(None, args, kwargs)
+
+    def _func(arguments, args, kwargs):
+        return advice(aspect, name, proceed, *args, **kwargs)
+    return _func
+
+
 def get_original(function):
     while function:
         orig_func = function
-        if isinstance(function, property):
-            fset = getattr(function.fset, '_orig_func', None)
-            if fset:
-                return function.setter(fset)
-        else:
-            function = getattr(function, '_orig_func', None)
+        if isinstance(function, AdvisedAttribute):
+            return function.original
+        joinpoint = _get_joinpoint(function)
+        function = joinpoint.func if joinpoint else None
     return orig_func
 
 
+@_weaving_pass
 def reset(joinpoint, cls=None, name=None):
+    _invalidate()
     if ismethod(joinpoint):
         setattr(cls or joinpoint.im_class, name or joinpoint.__name__,
                 get_original(joinpoint))
-    elif isinstance(joinpoint, property):
+    elif isinstance(joinpoint, AdvisedAttribute):
         setattr(cls, name, get_original(joinpoint))
     elif isinstance(joinpoint, basestring):
         for cls, members in get_members(joinpoint):
             for name, member in members:
                 reset(member, cls, name)
+
+
+@_synchronized
+def unweave_all():
+    """Unweaves all pointcuts, see `Pointcut.unweave`."""
+    for pointcut in list(_all_pointcuts):
+        pointcut.unweave()
@@ -0,0 +1,142 @@
+"""Sampling policies for advices.
+
+Pass a policy to the advice decorators to run the advice only on some calls:
+
+    class LoggerAspect(Aspect):
+        @before('Car.*', target='methods', sample=Every(1000))
+        def log_methods_calls(cls, method_name, obj, *args, **kwargs):
+            ...
+
+Skipped 'before' and 'after' advices are not called at all, skipped 'around'
+advices are replaced by a direct call to the next function.
+
+The policies keep their state for each advice and advised function, so
+sampling goes on when the advice chains are rebuilt, and a policy passed to
+several advices, or advising several functions, samples each of them on its
+own.
+"""
+import random
+from math import log
+from timeit import default_timer as clock
+
+__all__ = ['Every', 'Rate', 'PerSecond']
+
+
+class _Countdown(object):
+    """Base class for policies skipping a number of calls between runs.
+
+    Subclasses define `next`, returning how many calls to skip after running
+    the advice. Skipped calls only decrement a counter.
+    """
+    def __init__(self):
+        # Calls left to skip, by gate key
+        self._countdowns = {}
+
+    def first(self):
+        """Returns how many calls to skip before the first run."""
+        return self.next()
+
+    def gate(self, advice, around=False, key=None):
+        """Returns a function calling `advice` only on sampled calls.
+
+        The gates with the same `key`, the advice and the joinpoint, share
+        the calls left to skip.
+        """
+        next_skip = self.next
+        countdown = self._countdowns.get(key)
+        if countdown is None:
+            countdown = self._countdowns[key] = [self.first()]
+        if around:
+            def gate(aspect, name, next_, *args, **kwargs):
+                if countdown[0]:
+                    countdown[0] -= 1
+                    return next_(*args, **kwargs)
+                countdown[0] = next_skip()
+                return advice(aspect, name, next_, *args, **kwargs)
+        else:
+            def gate(*args, **kwargs):
+                if countdown[0]:
+                    countdown[0] -= 1
+                    return None
+                countdown[0] = next_skip()
+                return advice(*args, **kwargs)
+        return gate
+
+
+class Every(_Countdown):
+    """Runs the advice on the first call and then once every `n` calls."""
+    def __init__(self, n):
+        if n < 1:
+            raise ValueError('\'n\' must be at least 1 but got {}'.format(n))
+        super(Every, self).__init__()
+        self.n = n
+
+    def first(self):
+        return 0
+
+    def next(self):
+        return self.n - 1
+
+
+class Rate(_Countdown):
+    """Runs the advice on a random fraction `rate` of the calls.
+
+    Instead of drawing a random number on each call, the number of calls to
+    skip is drawn from the geometric distribution after each run.
+    """
+    def __init__(self, rate):
+        if not 0 < rate <= 1:
+            raise ValueError('\'rate\' must be in (0, 1] but got {}'.format(
+                rate))
+        super(Rate, self).__init__()
+        self.rate = rate
+
+    def next(self):
+        if self.rate == 1:
+            return 0
+        return int(log(1.0 - random.random()) / log(1.0 - self.rate))
+
+
+class PerSecond(object):
+    """Runs the advice at most `limit` times per second, with bursts of up to
+    `burst` runs (token bucket)."""
+    def __init__(self, limit, burst=None):
+        if limit <= 0:
+            raise ValueError('\'limit\' must be positive but got {}'.format(
+                limit))
+        self.limit = float(limit)
+        self.burst = float(burst or limit)
+        # Available tokens and the time they were counted, by gate key
+        self._buckets = {}
+
+    def gate(self, advice, around=False, key=None):
+        """Returns a function calling `advice` only on sampled calls.
+
+        The gates with the same `key`, the advice and the joinpoint, share
+        the tokens.
+        """
+        limit, burst = self.limit, self.burst
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = [burst, clock()]
+
+        def take():
+            now = clock()
+            tokens = min(burst, bucket[0] + (now - bucket[1]) * limit)
+            bucket[1] = now
+            if tokens >= 1:
+                bucket[0] = tokens - 1
+                return True
+            bucket[0] = tokens
+            return False
+
+        if around:
+            def gate(aspect, name, next_, *args, **kwargs):
+                if take():
+                    return advice(aspect, name, next_, *args, **kwargs)
+                return next_(*args, **kwargs)
+        else:
+            def gate(*args, **kwargs):
+                if take():
+                    return advice(*args, **kwargs)
+        return gate
@@ -0,0 +1,82 @@
+"""Activation of advices limited to a scope.
+
+Advices of scoped aspects run only while the aspect is active in the current
+thread:
+
+    class TracingAspect(Aspect):
+        scoped = True
+
+        @before('Repository.read')
+        def trace(cls, method_name, obj, *args, **kwargs):
+            ...
+
+    with TracingAspect.active():
+        repo.read(req)  # Traced
+    repo.read(req)  # Not traced
+
+Each thread has its own activation. Calls outside the scope cost one thread
+local lookup.
+
+The activation is per thread, not per task: generator based coroutines
+interleaved in the same thread share it, so a scope activated while one of
+them runs is also active in the others until it exits. Activate scopes
+around code that doesn't yield to other coroutines.
+"""
+import threading
+from contextlib import contextmanager
+
+__all__ = ['Scope']
+
+
+class _State(threading.local):
+    # How many times the scope was entered in the current thread
+    depth = 0
+
+
+class Scope(object):
+    """Scope where advices are active."""
+    def __init__(self):
+        self.state = _State()
+
+    @property
+    def active(self):
+        """Returns if the scope is active in the current thread."""
+        return self.state.depth > 0
+
+    @contextmanager
+    def activate(self):
+        """Context manager activating the scope in the current thread.
+
+        It can be nested.
+        """
+        state = self.state
+        state.depth += 1
+        try:
+            yield
+        finally:
+            state.depth -= 1
+
+    def dispatch(self, active, inactive):
+        """Returns a function calling `active` or `inactive` according to the
+        scope activation."""
+        state = self.state
+
+        def dispatch(*args, **kwargs):
+            if state.depth:
+                return active(*args, **kwargs)
+            return inactive(*args, **kwargs)
+        return dispatch
+
+    def gate(self, advice, around=False):
+        """Returns a function calling `advice` only inside the scope."""
+        state = self.state
+        if around:
+            def gate(aspect, name, next_, *args, **kwargs):
+                if state.depth:
+                    return advice(aspect, name, next_, *args, **kwargs)
+                return next_(*args, **kwargs)
+        else:
+            def gate(*args, **kwargs):
+                if state.depth:
+                    return advice(*args, **kwargs)
+        return gate
@@ -0,0 +1,109 @@
+"""Functions generated with the same signature of advised functions.
+
+The generic advised functions accept `*args, **kwargs` and repack the
+arguments at every layer. The functions created here have the exact argument
+list of the original function, so positional calls go through without
+building new tuples and dictionaries.
+"""
+from inspect import getargspec
+from types import FunctionType
+
+__all__ = ['get_signature']
+
+# Prefix used by all names referenced by the generated code, avoiding
+# conflicts with the names of the arguments
+PREFIX = '_ea_'
+
+_TEMPLATES = {
+    # The replacement for the original function
+    'wrapper': '''
+def wrapper({params}):
+    _ea_version, _ea_call = _ea_joinpoint.chain
+    if _ea_version != _ea_current[0]:
+        _ea_call = _ea_joinpoint.update_chain()
+    return _ea_call({args})
+''',
+    # The replacement for functions inherited from a parent class
+    'inherited_wrapper': '''
+def inherited_wrapper({params}):
+    _ea_cls = {obj}.__class__
+    _ea_chain = _ea_chains.get(_ea_id(_ea_cls))
+    if _ea_chain is None or _ea_chain[1] != _ea_current[0]:
+        _ea_call = _ea_joinpoint.update_class_chain(_ea_cls)
+    else:
+        _ea_call = _ea_chain[2]
+    return _ea_call({args})
+''',
+    # The original function wrapped with 'before' and 'after' advices
+    'call': '''
+def call({params}):
+    for _ea_before, _ea_aspect in _ea_befores:
+        _ea_before(_ea_aspect, _ea_name, {args})
+    _ea_ret = _ea_func({args})
+    for _ea_after, _ea_aspect in _ea_afters:
+        _ea_after(_ea_aspect, _ea_name, {args})
+    for _ea_after, _ea_aspect in _ea_returnings:
+        _ea_after(_ea_aspect, _ea_name, _ea_ret, {args})
+    return _ea_ret
+''',
+    # The function passed to 'around' advices
+    'around': '''
+def around({params}):
+    return _ea_advice(_ea_aspect, _ea_name, _ea_next, {args})
+''',
+}
+
+
+class Signature(object):
+    """Generates functions with the same signature of `func`.
+
+    Raises `TypeError` if the signature can't be reproduced.
+    """
+    def __init__(self, func):
+        args, varargs, keywords, defaults = getargspec(func)
+        names = list(args)
+        if varargs:
+            names.append(varargs)
+        if keywords:
+            names.append(keywords)
+        # Tuple parameters are not supported
+        if not all(isinstance(name, basestring) for name in names):
+            raise TypeError('Unsupported signature for {}'.format(func))
+        if any(name.startswith(PREFIX) for name in names):
+            raise TypeError('Arguments of {} conflict with the generated '
+                            'code'.format(func))
+        self.defaults = defaults
+        params = list(args)
+        if varargs:
+            params.append('*' + varargs)
+        if keywords:
+            params.append('**' + keywords)
+        params = ', '.join(params)
+        if args:
+            obj = args[0]
+        elif varargs:
+            obj = varargs + '[0]'
+        else:
+            obj = None
+        self.codes = {}
+        for template, source in _TEMPLATES.iteritems():
+            if obj is None and template == 'inherited_wrapper':
+                continue
+            namespace = {}
+            exec source.format(params=params, args=params, obj=obj) in (
+                namespace)
+            self.codes[template] = namespace[template].func_code
+
+    def make(self, template, namespace):
+        """Creates a function from `template` using `namespace` as globals."""
+        namespace['__builtins__'] = __builtins__
+        return FunctionType(self.codes[template], namespace, None,
+                            self.defaults)
+
+
+def get_signature(func):
+    """Returns a `Signature` for `func` or `None` if it isn't supported."""
+    try:
+        return Signature(func)
+    except TypeError:
+        return None
@@ -0,0 +1,134 @@
+"""Timing and call counting of advised functions and advices.
+
+The counters are kept per thread, so recording doesn't need locks, and are
+merged only when read.
+"""
+import threading
+from timeit import default_timer as clock
+
+__all__ = ['Stats', 'merge', 'combine']
+
+CALLS = 'calls'
+FUNCTION = 'function'
+ADVICES = 'advices'
+
+
+class Stats(object):
+    """Collects call counts, cumulative and max wall time per key.
+
+    The keys are tuples `(joinpoint, kind, advice name)`, with `kind` being
+    `CALLS` for the whole joinpoint, `FUNCTION` for the original function
+    alone or `ADVICES` for an advice.
+    """
+    def __init__(self):
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._counters = []
+
+    def _get_counters(self):
+        try:
+            return self._local.counters
+        except AttributeError:
+            # The lock is used only once per thread
+            counters = self._local.counters = {}
+            with self._lock:
+                self._counters.append(counters)
+            return counters
+
+    def record(self, key, elapsed):
+        counters = self._get_counters()
+        counter = counters.get(key)
+        if counter is None:
+            counters[key] = [1, elapsed, elapsed]
+        else:
+            counter[0] += 1
+            counter[1] += elapsed
+            if elapsed > counter[2]:
+                counter[2] = elapsed
+
+    def timed(self, func, key):
+        """Returns a function calling `func` and recording its time."""
+        record = self.record
+
+        def timed(*args, **kwargs):
+            start = clock()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                record(key, clock() - start)
+        return timed
+
+    def snapshot(self):
+        """Returns the counters merged from all threads.
+
+        The result is a dictionary like:
+
+            {'Class.method': {
+                'calls': {'count': 2, 'total': 0.2, 'max': 0.15},
+                'function': {'count': 2, 'total': 0.1, 'max': 0.07},
+                'advices': {'advice_name': {'count': 2, ...}}}}
+
+        """
+        with self._lock:
+            counters = list(self._counters)
+        result = {}
+        for thread_counters in counters:
+            for (joinpoint, kind, advice), (count, total, max_) in (
+                    thread_counters.items()):
+                stats = result.setdefault(joinpoint, {})
+                if kind == ADVICES:
+                    stats = stats.setdefault(ADVICES, {})
+                    kind = advice
+                _add(stats, kind,
+                     {'count': count, 'total': total, 'max': max_})
+        return result
+
+
+def _add(stats, key, counter):
+    """Adds the values from `counter` to the values in `stats[key]`."""
+    if key in stats:
+        values = stats[key]
+        values['count'] += counter['count']
+        values['total'] += counter['total']
+        values['max'] = max(values['max'], counter['max'])
+    else:
+        stats[key] = dict(counter)
+
+
+def merge(*snapshots):
+    """Merges snapshots returned by `Stats.snapshot`."""
+    result = {}
+    for snapshot in snapshots:
+        for joinpoint, stats in snapshot.items():
+            merged = result.setdefault(joinpoint, {})
+            for kind, values in stats.items():
+                if kind == ADVICES:
+                    advices = merged.setdefault(ADVICES, {})
+                    for advice, counter in values.items():
+                        _add(advices, advice, counter)
+                else:
+                    _add(merged, kind, values)
+    return result
+
+
+def combine(*snapshots):
+    """Combines snapshots of pointcuts sharing advised functions, like the
+    pointcuts of an aspect.
+
+    Every instrumented pointcut of a joinpoint records its calls and the
+    time of its function, so the same calls are in several snapshots. They
+    are counted once, from the snapshot with most calls. Advices add up like
+    in `merge`.
+    """
+    result = {}
+    for snapshot in snapshots:
+        for joinpoint, stats in snapshot.items():
+            combined = result.setdefault(joinpoint, {})
+            for kind, values in stats.items():
+                if kind == ADVICES:
+                    advices = combined.setdefault(ADVICES, {})
+                    for advice, counter in values.items():
+                        _add(advices, advice, counter)
+                elif values['count'] > combined.get(kind, {}).get('count', 0):
+                    combined[kind] = dict(values)
+    return result
@@ -1,15 +1,179 @@
 import fnmatch
+import imp
+import re
+import sys
+import threading
+from collections import defaultdict
+from contextlib import contextmanager
 from importlib import import_module
 from inspect import ismethod, isclass, ismodule, currentframe
 
-__all__ = ['get_module', 'get_classes', 'get_properties', 'get_methods']
+__all__ = ['get_module', 'get_classes', 'get_properties', 'get_methods',
+           'compile_pattern', 'filter_names', 'weaving', 'register',
+           'weaving_lock', 'import_lock']
+
+# Serializes the changes to the weaving state: weaving passes, advices,
+# enabling and disabling. Advised functions never take it.
+weaving_lock = threading.RLock()
+
+# Prefix of the names of easyaspect modules
+_package = __name__.rsplit('.', 1)[0] + '.'
+
+# Classes from registered modules by name
+_registry = defaultdict(list)
+
+# Matchers compiled from patterns, the `fnmatch` cache is too small and is
+# entirely cleared when full
+_patterns = {}
+
+# Names of the members of classes and modules, kept only during a weaving
+# pass (see `weaving`)
+_index = {}
+_passes = [0]
+
+
+def _compile(pattern):
+    """Returns the matcher for `pattern` and if it is a literal name."""
+    try:
+        return _patterns[pattern]
+    except KeyError:
+        if any(char in pattern for char in '*?['):
+            compiled = (re.compile(fnmatch.translate(pattern)).match, False)
+        else:
+            # No wildcards, a simple comparison is enough
+            compiled = (pattern.__eq__, True)
+        _patterns[pattern] = compiled
+        return compiled
+
+
+def compile_pattern(pattern):
+    """Returns a function testing if a name matches `pattern`.
+
+    The argument `pattern` should be a string that can contain wildcards.
+    """
+    return _compile(pattern)[0]
+
+
+@contextmanager
+def weaving():
+    """Context manager delimiting a weaving pass.
+
+    During the pass the members of each class or module are listed only once.
+    Passes can be nested, the members are forgotten when the outermost ends.
+    The pass holds `weaving_lock` only, imports in the pass take the import
+    lock with `import_lock`.
+    """
+    with weaving_lock:
+        _passes[0] += 1
+        try:
+            yield
+        finally:
+            _passes[0] -= 1
+            if not _passes[0]:
+                _index.clear()
+
+
+@contextmanager
+def import_lock():
+    """Context manager holding the import lock, for imports and checks of
+    `sys.modules` during weaving.
+
+    As weaving may import modules and importing modules may weave, the
+    import lock is always taken before `weaving_lock`: a thread holding
+    `weaving_lock` releases it while waiting for the import lock, as
+    `threading.Condition` does, and takes it back after.
+    """
+    if weaving_lock._is_owned():
+        state = weaving_lock._release_save()
+        try:
+            imp.acquire_lock()
+        finally:
+            weaving_lock._acquire_restore(state)
+    else:
+        imp.acquire_lock()
+    try:
+        yield
+    finally:
+        imp.release_lock()
+
+
+def _get_names(obj):
+    """Returns the members names of `obj` as a list and as a set."""
+    names = _index.get(obj) if _passes[0] else None
+    if names is None:
+        names = dir(obj)
+        names = (names, frozenset(names))
+        if _passes[0]:
+            _index[obj] = names
+    return names
+
+
+def filter_names(obj, pattern):
+    """Returns the names of `obj` members that match `pattern`.
+
+    The argument `obj` can be a class, a module or a dictionary. The argument
+    `pattern` should be a string that can contain wildcards.
+    """
+    if isinstance(obj, dict):
+        names = (obj.keys(), obj)
+    else:
+        names = _get_names(obj)
+    match, literal = _compile(pattern)
+    if literal:
+        return [pattern] if pattern in names[1] else []
+    return [name for name in names[0] if match(name)]
 
 
 def get_module(module_name):
     """Imports and returns a module."""
     if not module_name:
         return None
-    return import_module(module_name)
+    module = sys.modules.get(module_name)
+    if module is None:
+        with import_lock():
+            module = import_module(module_name)
+    return module
+
+
+def register(*modules):
+    """Registers the classes from `modules` to be found by their names alone.
+
+    The arguments can be module objects or module names. Registering a module
+    again adds the classes created since the previous registration.
+    """
+    for module in modules:
+        if isinstance(module, basestring):
+            module = get_module(module)
+        for attr in vars(module).values():
+            if isclass(attr) and not attr in _registry[attr.__name__]:
+                _registry[attr.__name__].append(attr)
+
+
+def _get_registered_classes(pattern):
+    """Returns the registered classes with names that match `pattern`.
+
+    Raises `ValueError` if a name matches classes from different modules.
+    """
+    classes = []
+    for name in filter_names(_registry, pattern):
+        if len(_registry[name]) > 1:
+            raise ValueError('Ambiguous class name \'{}\': {}'.format(
+                name, ', '.join('{}.{}'.format(cls.__module__, cls.__name__)
+                                for cls in _registry[name])))
+        classes += _registry[name]
+    return classes
+
+
+def _get_caller_globals():
+    """Returns the globals of the first frame outside of easyaspect."""
+    frame = currentframe()
+    try:
+        while frame.f_globals.get('__name__', '').startswith(_package):
+            frame = frame.f_back
+        return frame.f_globals
+    finally:
+        # Avoid leaks
+        del frame
 
 
 def get_classes(module, pattern=None):
@@ -18,6 +182,10 @@ def get_classes(module, pattern=None):
     The argument `module` can be a string, a module object (see get_module)
     or a dictionary, like the one returned by `globals()` for example.
     The argument `pattern` should be a string that can contain wildcards.
+
+    When `module` is a class name without the module name, the class is
+    searched in the module calling easyaspect and then in the modules added
+    with `register`.
     """
     if isclass(module):
         return [module]
@@ -25,34 +193,19 @@ def get_classes(module, pattern=None):
         if '.' in module:
             return get_classes(*module.rsplit('.', 1))
         else:
-            classes = []
+            # Got only the class and the method names. Look for the class in
+            # the module using easyaspect and then in the registered modules.
             pattern = module
-            # Got only the class and the method names
-            # Lets inspect the execution frame stack to get the class
-            # reference
-            frame_ = currentframe()
-            try:
-                # Go back frames in execution stack to reach this class
-                # initialization and try to find the reference to the class
-                # we are looking for.
-                frame = frame_
-                while frame:
-                    classes += get_classes(frame.f_globals, pattern)
-                    frame = getattr(frame, 'f_back', None)
-            finally:
-                # Avoid leaks
-                del frame_
-                del frame
-            return list(set(classes))  # Remove duplicates
+            return (get_classes(_get_caller_globals(), pattern) or
+                    _get_registered_classes(pattern))
     if isinstance(module, basestring):
         return get_classes(get_module(module), pattern)
     # Get the classes from a module
     elif ismodule(module):
-        attrs = (getattr(module, n)
-                 for n in fnmatch.filter(dir(module), pattern))
+        attrs = (getattr(module, n) for n in filter_names(module, pattern))
     # Get the classes from a dictionary
     elif isinstance(module, dict):
-        attrs = (module[n] for n in fnmatch.filter(module.keys(), pattern))
+        attrs = (module[n] for n in filter_names(module, pattern))
     else:
         raise TypeError(
             '\'get_classes\' requires a string, a module object or a '
@@ -82,14 +235,23 @@ def get_members(cls, pattern=None, filter_func=lambda a: True):
     """Returns a list of `cls` members that match `pattern`.
 
     The argument `pattern` should be a string that can contain wildcards.
+    A class without `pattern` has all its members matched. The argument `cls`
+    can also be an expression from `easyaspect.expression`, without
+    `pattern`.
     """
     if not pattern and isinstance(cls, basestring):
         cls, pattern = cls.rsplit('.', 1)
         return get_members(cls, pattern, filter_func)
     elif isclass(cls) or isinstance(cls, basestring):
-        return [(cls_, [(name, getattr(cls_, name))
-                        for name in fnmatch.filter(dir(cls_), pattern)
-                        if filter_func(getattr(cls_, name))])
-                for cls_ in get_classes(cls)]
+        members = []
+        for cls_ in get_classes(cls):
+            attrs = ((name, getattr(cls_, name))
+                     for name in filter_names(cls_, pattern or '*'))
+            members.append(
+                (cls_, [(name, attr) for name, attr in attrs
+                        if filter_func(attr)]))
+        return members
+    elif hasattr(cls, 'get_members'):
+        return cls.get_members(filter_func)
     else:
         return []
@@ -9,6 +9,7 @@ except ImportError:
     import mock
 
 from easyaspect.advice import _Advice, before, after, around
+from easyaspect.guard import Guard, In
 
 
 class Test_Advice(unittest.TestCase):
@@ -23,6 +24,7 @@ class Test_Advice(unittest.TestCase):
         self.assertEqual('target', advice.target)
         self.assertEqual(func, advice.func)
         self.assertEqual('func', advice.name)
+        self.assertEqual(None, advice.sample)
 
     def test_callable(self):
         mocked = mock.Mock(['__name__'])
@@ -71,3 +73,36 @@ class TestDecorators(unittest.TestCase):
         self.assertEqual('around', wrapped._advices[0].type)
         self.assertEqual('_spam', wrapped._advices[0].target)
         self.assertEqual(func, wrapped._advices[0].func)
+
+    def test_sample(self):
+
+        def func():
+            pass
+
+        wrapped = before(['DummyClass.*'], sample='_policy')(func)
+        self.assertEqual('_policy', wrapped._advices[0].sample)
+
+    def test_guard(self):
+
+        def func():
+            pass
+
+        def is_positive(obj, value):
+            return value > 0
+
+        wrapped = before(['DummyClass.*'], guard=is_positive)(func)
+        self.assertTrue(isinstance(wrapped._advices[0].guard, Guard))
+        self.assertEqual(is_positive, wrapped._advices[0].guard.func)
+        guard = In('value', [1])
+        wrapped = around(['DummyClass.*'], guard=guard)(func)
+        self.assertEqual(guard, wrapped._advices[1].guard)
+
+    def test_bind(self):
+
+        def func():
+            pass
+
+        wrapped = before(['DummyClass.*'])(func)
+        self.assertFalse(wrapped._advices[0].bind)
+        wrapped = after(['DummyClass.*'], bind=True)(func)
+        self.assertTrue(wrapped._advices[1].bind)
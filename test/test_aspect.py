@@ -8,7 +8,12 @@ try:
 except ImportError:
     import mock
 
-from easyaspect import Aspect, Pointcut, before
+from easyaspect import Aspect, Pointcut, before, reset
+
+
+class InstrumentedClass(object):
+    def method(self, a):
+        return a
 
 
 class TestAspect(unittest.TestCase):
@@ -84,3 +89,79 @@ class TestAspect(unittest.TestCase):
         DummyAspect.enable('spam')
         DummyAspect.named_pointcut.enable.assert_called_once_with('spam')
         DummyAspect.another_pointcut.enable.assert_called_once_with('spam')
+
+    def test_stats(self):
+
+        class DummyAspect(Aspect):
+            @before('InstrumentedClass.method')
+            def advice_func(cls, joinpoint, obj, a):
+                pass
+
+        try:
+            InstrumentedClass().method(1)
+            self.assertEqual({}, DummyAspect.stats())
+            DummyAspect.instrument()
+            InstrumentedClass().method(1)
+            InstrumentedClass().method(2)
+            DummyAspect.instrument(False)
+            InstrumentedClass().method(3)
+            stats = DummyAspect.stats()['InstrumentedClass.method']
+            self.assertEqual(2, stats['calls']['count'])
+            self.assertEqual(2, stats['function']['count'])
+            self.assertEqual(2, stats['advices']['advice_func']['count'])
+            self.assertTrue(stats['calls']['total'] >=
+                            stats['function']['total'])
+        finally:
+            reset('InstrumentedClass.method')
+
+    def test_stats_of_overlapping_pointcuts(self):
+
+        class DummyAspect(Aspect):
+            @before('InstrumentedClass.method')
+            def advice_func(cls, joinpoint, obj, a):
+                pass
+
+            @before('InstrumentedClass.*')
+            def another_advice_func(cls, joinpoint, obj, a):
+                pass
+
+        try:
+            DummyAspect.instrument()
+            InstrumentedClass().method(1)
+            stats = DummyAspect.stats()['InstrumentedClass.method']
+            self.assertEqual(1, stats['calls']['count'])
+            self.assertEqual(1, stats['function']['count'])
+            self.assertEqual(1, stats['advices']['advice_func']['count'])
+        finally:
+            reset('InstrumentedClass.method')
+
+    def test_unweave(self):
+        original = vars(InstrumentedClass)['method']
+
+        class DummyAspect(Aspect):
+            @before('InstrumentedClass.method')
+            def advice_func(cls, joinpoint, obj, a):
+                pass
+
+        self.assertFalse(vars(InstrumentedClass)['method'] is original)
+        DummyAspect.unweave()
+        self.assertTrue(vars(InstrumentedClass)['method'] is original)
+
+    def test_inherited_named_pointcut_advices(self):
+        calls = []
+
+        class BaseAspect(Aspect):
+            advised = None
+
+            @before('advised')
+            def advice_func(cls, joinpoint, obj, a):
+                calls.append((cls.__name__, a))
+
+        class DummyAspect(BaseAspect):
+            advised = Pointcut('InstrumentedClass.method')
+
+        try:
+            InstrumentedClass().method(1)
+            self.assertEqual([('DummyAspect', 1)], calls)
+        finally:
+            DummyAspect.unweave()
@@ -0,0 +1,133 @@
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import threading
+import unittest
+
+from easyaspect.advice import _Advice, after, before
+from easyaspect.background import Worker, BLOCK, DROP, INLINE
+from easyaspect.pointcut import Pointcut
+
+
+class TestWorker(unittest.TestCase):
+    def setUp(self):
+        self.calls = []
+        self.threads = []
+        self.event = threading.Event()
+
+    def call(self, value):
+        self.calls.append(value)
+        self.threads.append(threading.current_thread())
+
+    def blocked_call(self, value):
+        self.event.wait()
+        self.call(value)
+
+    def test_submit(self):
+        worker = Worker()
+        worker.submit(self.call, (1,), {})
+        worker.wrap(self.call)(2)
+        worker.flush()
+        self.assertEqual([1, 2], self.calls)
+        self.assertFalse(threading.current_thread() in self.threads)
+        worker.shutdown()
+
+    def test_overflow_drop(self):
+        worker = Worker(maxsize=1, overflow=DROP)
+        worker.submit(self.blocked_call, (1,), {})
+        worker.submit(self.call, (2,), {})
+        worker.submit(self.call, (3,), {})
+        worker.submit(self.call, (4,), {})
+        self.event.set()
+        worker.shutdown()
+        self.assertTrue(worker.dropped >= 1)
+        self.assertEqual(4 - worker.dropped, len(self.calls))
+
+    def test_overflow_inline(self):
+        worker = Worker(maxsize=1, overflow=INLINE)
+        worker.submit(self.blocked_call, (1,), {})
+        for i in range(2, 5):
+            worker.submit(self.call, (i,), {})
+        self.assertTrue(threading.current_thread() in self.threads)
+        self.event.set()
+        worker.shutdown()
+        self.assertEqual([1, 2, 3, 4], sorted(self.calls))
+
+    def test_overflow_block(self):
+        worker = Worker(maxsize=1, overflow=BLOCK)
+        self.event.set()
+        for i in range(10):
+            worker.submit(self.call, (i,), {})
+        worker.shutdown()
+        self.assertEqual(range(10), self.calls)
+
+    def test_invalid_overflow(self):
+        self.assertRaises(ValueError, Worker, overflow='spam')
+
+    def test_submit_after_shutdown(self):
+        worker = Worker()
+        worker.submit(self.call, (1,), {})
+        worker.shutdown()
+        worker.submit(self.call, (2,), {})
+        worker.shutdown()
+        self.assertEqual([1], self.calls)
+        self.assertEqual(1, worker.dropped)
+        self.assertFalse(worker._thread.is_alive())
+
+    def test_submit_while_shutting_down(self):
+        worker = Worker()
+        errors = []
+        stop = threading.Event()
+
+        def submit():
+            try:
+                while not stop.is_set():
+                    worker.submit(self.call, (1,), {})
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=submit) for i in range(4)]
+        for thread in threads:
+            thread.start()
+        worker.shutdown()
+        stop.set()
+        for thread in threads:
+            thread.join()
+        self.assertEqual([], errors)
+        self.assertFalse(worker._thread and worker._thread.is_alive())
+        # Nothing was left in the queue
+        worker.flush()
+
+
+class TestBackgroundAdvice(unittest.TestCase):
+    def test_only_after_advices(self):
+        self.assertRaises(ValueError, before, 'DummyClass.*',
+                          background=True)
+
+    def test_run_in_background(self):
+
+        class Dummy(object):
+            def method(self, a):
+                return a * 2
+
+        calls = []
+
+        def advice(aspect, name, result, obj, a):
+            calls.append((name, result, a, threading.current_thread()))
+
+        worker = Worker()
+        pointcut = Pointcut(Dummy.method)
+        pointcut.add_advice(_Advice('after', pointcut, 'all', advice,
+                                    background=worker))
+        self.assertEqual(4, Dummy().method(2))
+        worker.flush()
+        self.assertEqual(1, len(calls))
+        self.assertEqual(('method', 4, 2), calls[0][:3])
+        self.assertNotEqual(threading.current_thread(), calls[0][3])
+        worker.shutdown()
+
+    def test_decorator(self):
+        worker = Worker()
+        wrapped = after(['DummyClass.*'], background=worker)(lambda: None)
+        self.assertEqual(worker, wrapped._advices[0].background)
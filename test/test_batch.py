@@ -0,0 +1,135 @@
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import unittest
+try:
+    from unittest import mock
+except ImportError:
+    import mock
+
+from easyaspect import Pointcut
+from easyaspect.batch import BatchAspect, Batcher, Failure, flush_all
+
+
+class Repository(object):
+    def save(self, item):
+        raise AssertionError('Not batched')
+
+
+class Users(object):
+    def save(self, item):
+        raise AssertionError('Not batched')
+
+
+class Orders(Users):
+    def save(self, item):
+        raise AssertionError('Not batched')
+
+
+class TestBatcher(unittest.TestCase):
+    def test_flush_on_size(self):
+        func = mock.Mock(side_effect=lambda calls: [args[0] * 2
+                                                    for _, args, _ in calls])
+        batcher = Batcher(func, size=3, interval=60)
+        futures = [batcher.submit(None, (i,), {}) for i in range(4)]
+        func.assert_called_once_with([(None, (0,), {}), (None, (1,), {}),
+                                      (None, (2,), {})])
+        self.assertEqual([0, 2, 4], [future.result(0) for future in
+                                     futures[:3]])
+        self.assertFalse(futures[3].done())
+        batcher.flush()
+        self.assertEqual(6, futures[3].result(0))
+
+    def test_flush_on_interval(self):
+        batcher = Batcher(lambda calls: ['done'] * len(calls), size=100,
+                          interval=0.01)
+        future = batcher.submit(None, (), {})
+        self.assertEqual('done', future.result(5))
+
+    def test_batch_error(self):
+        batcher = Batcher(lambda calls: 1 / 0, size=2)
+        futures = [batcher.submit(None, (), {}) for i in range(2)]
+        for future in futures:
+            self.assertRaises(ZeroDivisionError, future.result, 0)
+
+    def test_failure(self):
+        error = ValueError()
+        batcher = Batcher(lambda calls: ['ok', Failure(error)], size=2)
+        futures = [batcher.submit(None, (), {}) for i in range(2)]
+        self.assertEqual('ok', futures[0].result(0))
+        self.assertTrue(futures[1].exception(0) is error)
+
+    def test_wrong_number_of_results(self):
+        batcher = Batcher(lambda calls: [], size=1)
+        self.assertRaises(ValueError, batcher.submit(None, (), {}).result, 0)
+
+    def test_thread_stops_when_idle(self):
+        batcher = Batcher(lambda calls: [None] * len(calls), interval=0.01)
+        batcher.submit(None, (), {}).result(5)
+        thread = batcher._thread
+        if thread is not None:
+            thread.join(5)
+        self.assertTrue(batcher._thread is None)
+        # A new thread flushes the next calls
+        self.assertEqual(None, batcher.submit(None, (), {}).result(5))
+
+    def test_flush_all(self):
+        batcher = Batcher(lambda calls: [1] * len(calls), interval=60)
+        future = batcher.submit(None, (), {})
+        flush_all()
+        self.assertEqual(1, future.result(0))
+
+
+class TestBatchAspect(unittest.TestCase):
+    def tearDown(self):
+        self.aspect.unweave()
+
+    def test_batch(self):
+        batches = []
+
+        def save_all(joinpoint, calls):
+            batches.append((joinpoint, [args[0] for _, args, _ in calls]))
+            return [len(args[0]) for _, args, _ in calls]
+
+        class BatchedSaves(BatchAspect):
+            batched = Pointcut('Repository.save')
+            batch = staticmethod(save_all)
+            size = 2
+            interval = 60
+
+        self.aspect = BatchedSaves
+        repo = Repository()
+        futures = [repo.save('a'), repo.save('bb'), repo.save('ccc')]
+        self.assertEqual([('save', ['a', 'bb'])], batches)
+        BatchedSaves.flush()
+        self.assertEqual([('save', ['a', 'bb']), ('save', ['ccc'])], batches)
+        self.assertEqual([1, 2, 3], [future.result(0) for future in futures])
+
+    def test_batch_not_defined(self):
+
+        class BatchedSaves(BatchAspect):
+            batched = Pointcut('Repository.save')
+
+        self.aspect = BatchedSaves
+        self.assertRaises(NotImplementedError, Repository().save, 'a')
+
+    def test_same_name_in_classes(self):
+        batches = []
+
+        def save_all(joinpoint, calls):
+            batches.append((joinpoint.label, [obj.__class__.__name__
+                                              for obj, _, _ in calls]))
+            return [None] * len(calls)
+
+        class BatchedSaves(BatchAspect):
+            batched = Pointcut(['Users.save', 'Orders.save'])
+            batch = staticmethod(save_all)
+            interval = 60
+
+        self.aspect = BatchedSaves
+        Users().save(1)
+        Orders().save(2)
+        BatchedSaves.flush()
+        self.assertEqual([('Orders.save', ['Orders']),
+                          ('Users.save', ['Users'])], sorted(batches))
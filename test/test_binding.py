@@ -0,0 +1,165 @@
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import unittest
+try:
+    from unittest import mock
+except ImportError:
+    import mock
+
+from easyaspect.advice import _Advice
+from easyaspect.binding import Binder
+from easyaspect.guard import In
+from easyaspect.pointcut import Pointcut
+
+
+class Account(object):
+    def transfer(self, amount, currency='EUR', *notes, **options):
+        return amount
+
+    def steps(self, count):
+        for i in range(count):
+            yield i
+
+
+class TestBinder(unittest.TestCase):
+    def setUp(self):
+        self.binder = Binder(Account.transfer.im_func)
+
+    def test_bind(self):
+        self.assertEqual(
+            {'self': 'obj', 'amount': 1, 'currency': 'EUR', 'notes': (),
+             'options': {}},
+            self.binder.bind('obj', 1))
+        self.assertEqual(
+            {'self': 'obj', 'amount': 1, 'currency': 'USD',
+             'notes': ('a', 'b'), 'options': {'fast': True}},
+            self.binder.bind('obj', 1, 'USD', 'a', 'b', fast=True))
+        self.assertEqual(
+            {'self': 'obj', 'amount': 1, 'currency': 'USD', 'notes': (),
+             'options': {}},
+            self.binder.bind('obj', currency='USD', amount=1))
+
+    def test_bind_invalid(self):
+        self.assertRaises(TypeError, self.binder.bind, 'obj')
+
+    def test_unbind(self):
+        arguments = self.binder.bind('obj', 1, 'USD', 'a', fast=True)
+        self.assertEqual((['obj', 1, 'USD', 'a'], {'fast': True}),
+                         self.binder.unbind(arguments))
+
+    def test_tuple_parameters(self):
+        exec 'def func(self, (a, b)):\n    pass\n'
+        binder = Binder(func)
+        self.assertEqual({'self': 'obj', 'a': 1, 'b': 2},
+                         binder.bind('obj', (1, 2)))
+        self.assertRaises(TypeError, binder.unbind, {})
+
+
+class TestBoundAdvices(unittest.TestCase):
+    def setUp(self):
+        self.pointcut = Pointcut('Account.transfer')
+        self.calls = []
+
+    def tearDown(self):
+        self.pointcut.unweave()
+
+    def add(self, type, func, **kwargs):
+        self.pointcut.add_advice(_Advice(type, self.pointcut, 'all', func,
+                                         **kwargs))
+
+    def test_shared_arguments(self):
+        calls = self.calls
+
+        def before(aspect, name, arguments):
+            calls.append(arguments)
+
+        def after(aspect, name, arguments):
+            calls.append(arguments)
+
+        def unbound(aspect, name, obj, amount, *args, **kwargs):
+            calls.append(amount)
+
+        self.add('before', before, bind=True)
+        self.add('before', unbound)
+        self.add('after', after, bind=True)
+        self.assertEqual(5, Account().transfer(5, 'USD'))
+        self.assertEqual(5, calls[1])
+        self.assertEqual(5, calls[0]['amount'])
+        self.assertEqual('USD', calls[0]['currency'])
+        self.assertTrue(calls[0] is calls[2])
+
+    def test_bound_around(self):
+        calls = self.calls
+
+        def around(aspect, name, next_, arguments):
+            calls.append(arguments)
+            if arguments['amount'] > 10:
+                arguments = dict(arguments, amount=10)
+            return next_(arguments)
+
+        def before(aspect, name, arguments):
+            calls.append(arguments)
+
+        self.add('before', before, bind=True)
+        self.add('around', around, bind=True)
+        account = Account()
+        self.assertEqual(5, account.transfer(5))
+        # Shared while the arguments don't change
+        self.assertTrue(calls[0] is calls[1])
+        self.assertEqual(10, account.transfer(20, 'USD', 'note'))
+        self.assertEqual(20, calls[2]['amount'])
+        self.assertEqual(10, calls[3]['amount'])
+        self.assertEqual(('note',), calls[3]['notes'])
+
+    def test_unbound_around(self):
+        calls = self.calls
+
+        def around(aspect, name, next_, obj, amount, *args, **kwargs):
+            return next_(obj, amount * 2, *args, **kwargs)
+
+        def before(aspect, name, arguments):
+            calls.append(arguments['amount'])
+
+        self.add('before', before, bind=True)
+        self.add('around', around)
+        self.assertEqual(6, Account().transfer(3))
+        self.assertEqual([6], calls)
+
+    def test_guard(self):
+        calls = self.calls
+
+        def before(aspect, name, arguments):
+            calls.append(arguments['amount'])
+
+        self.add('before', before, bind=True,
+                 guard=In('currency', ['USD']))
+        account = Account()
+        account.transfer(1)
+        account.transfer(2, 'USD')
+        self.assertEqual([2], calls)
+
+    def test_background(self):
+        calls = self.calls
+
+        def after(aspect, name, ret, arguments):
+            calls.append((ret, arguments['amount']))
+
+        worker = mock.Mock(['wrap'])
+        worker.wrap.side_effect = lambda func: func
+        self.add('after', after, bind=True, background=worker)
+        Account().transfer(4)
+        self.assertEqual([(4, 4)], calls)
+
+    def test_coroutine(self):
+        self.pointcut.unweave()
+        self.pointcut = Pointcut('Account.steps')
+        calls = self.calls
+
+        def before(aspect, name, arguments):
+            calls.append(arguments['count'])
+
+        self.add('before', before, bind=True)
+        self.assertEqual([0, 1], list(Account().steps(2)))
+        self.assertEqual([2], calls)
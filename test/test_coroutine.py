@@ -0,0 +1,124 @@
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import unittest
+from inspect import isgenerator
+
+from easyaspect import coroutine
+from easyaspect.advice import _Advice
+from easyaspect.pointcut import Pointcut
+
+
+class Return(Exception):
+    def __init__(self, value):
+        self.value = value
+
+
+class TestDelegate(unittest.TestCase):
+    def test_forward_values(self):
+
+        def gen():
+            received = yield 1
+            received = yield received * 10
+            yield received * 100
+
+        delegated = coroutine.delegate(iter([None, gen()]), [None])
+        self.assertEqual(1, next(delegated))
+        self.assertEqual(20, delegated.send(2))
+        self.assertEqual(300, delegated.send(3))
+        self.assertRaises(StopIteration, next, delegated)
+
+    def test_forward_exceptions(self):
+
+        def gen():
+            try:
+                yield 1
+            except KeyError:
+                yield 'caught'
+
+        delegated = coroutine.delegate(iter([gen()]), [None])
+        next(delegated)
+        self.assertEqual('caught', delegated.throw(KeyError))
+
+
+class TestCoroutineAdvices(unittest.TestCase):
+    def setUp(self):
+        self.calls = []
+        calls = self.calls
+
+        class Dummy(object):
+            def method(self, a):
+                calls.append('start')
+                b = yield a
+                calls.append(('end', b))
+                raise Return(a + b)
+
+        self.Dummy = Dummy
+        self.pointcut = Pointcut(Dummy.method)
+        coroutine.RETURN_EXCEPTIONS.append(Return)
+
+    def tearDown(self):
+        coroutine.RETURN_EXCEPTIONS.remove(Return)
+
+    def add_advice(self, type, func, **kwargs):
+        self.pointcut.add_advice(_Advice(type, self.pointcut, 'all', func,
+                                         **kwargs))
+
+    def test_advices_around_execution(self):
+        self.add_advice('before', lambda *args: self.calls.append('before'))
+        self.add_advice('after', lambda *args: self.calls.append('after'))
+        gen = self.Dummy().method(1)
+        self.assertTrue(isgenerator(gen))
+        self.assertEqual([], self.calls)
+        self.assertEqual(1, next(gen))
+        self.assertEqual(['before', 'start'], self.calls)
+        try:
+            gen.send(2)
+        except Return as e:
+            self.assertEqual(3, e.value)
+        else:
+            self.fail('Return not raised')
+        self.assertEqual(['before', 'start', ('end', 2), 'after'],
+                         self.calls)
+
+    def test_generator_advices(self):
+
+        def before(aspect, name, obj, a):
+            value = yield 'waiting'
+            self.calls.append(('before', value))
+
+        self.add_advice('before', before)
+        gen = self.Dummy().method(1)
+        self.assertEqual('waiting', next(gen))
+        self.assertEqual(1, gen.send('ready'))
+        self.assertEqual([('before', 'ready'), 'start'], self.calls)
+
+    def test_returned_value(self):
+
+        class Worker(object):
+            def wrap(self, func):
+                return func
+
+        def after(aspect, name, result, obj, a):
+            self.calls.append(('after', result))
+
+        self.add_advice('after', after, background=Worker())
+        gen = self.Dummy().method(1)
+        next(gen)
+        self.assertRaises(Return, gen.send, 2)
+        self.assertEqual(('after', 3), self.calls[-1])
+
+    def test_around_advice(self):
+
+        def around(aspect, name, next_, obj, a):
+            self.calls.append('around')
+            gen = next_(obj, a * 2)
+            yield next(gen)
+            gen.send(5)
+
+        self.add_advice('around', around)
+        gen = self.Dummy().method(1)
+        self.assertEqual(2, next(gen))
+        self.assertRaises(Return, next, gen)
+        self.assertEqual(['around', 'start', ('end', 5)], self.calls)
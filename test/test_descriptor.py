@@ -0,0 +1,143 @@
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import unittest
+try:
+    from unittest import mock
+except ImportError:
+    import mock
+
+from easyaspect import Aspect, Pointcut, before, reset
+from easyaspect.descriptor import AdvisedAttribute
+
+
+class Plain(object):
+    value = 0
+
+
+class Slotted(object):
+    __slots__ = ('value',)
+
+
+class WithProperty(object):
+    def __init__(self):
+        self._value = 0
+
+    @property
+    def value(self):
+        return self._value
+
+    @value.setter
+    def value(self, value):
+        self._value = value
+
+
+class TestAdvisedAttribute(unittest.TestCase):
+    def test_plain_attribute(self):
+
+        class Dummy(object):
+            value = 1
+
+        Dummy.value = AdvisedAttribute('value', 1)
+        obj = Dummy()
+        self.assertEqual(1, obj.value)
+        obj.value = 2
+        self.assertEqual({'value': 2}, vars(obj))
+        self.assertEqual(2, obj.value)
+        del obj.value
+        self.assertEqual(1, obj.value)
+        self.assertRaises(AttributeError, delattr, obj, 'value')
+
+    def test_slot(self):
+
+        class Dummy(object):
+            __slots__ = ('value',)
+
+        Dummy.value = AdvisedAttribute('value', Dummy.value)
+        obj = Dummy()
+        self.assertRaises(AttributeError, getattr, obj, 'value')
+        obj.value = 2
+        self.assertEqual(2, obj.value)
+        self.assertFalse(hasattr(obj, '__dict__'))
+
+    def test_property(self):
+        attribute = AdvisedAttribute('value', WithProperty.value)
+        self.assertEqual(WithProperty.value.fget, attribute.get)
+        self.assertEqual(WithProperty.value.fset, attribute.set)
+
+    def test_advised_accessors(self):
+
+        class Dummy(object):
+            value = 1
+
+        attribute = Dummy.value = AdvisedAttribute('value', 1)
+        attribute.fget = mock.Mock(return_value=3)
+        attribute.fset = mock.Mock()
+        obj = Dummy()
+        self.assertEqual(3, obj.value)
+        obj.value = 2
+        attribute.fget.assert_called_once_with(obj)
+        attribute.fset.assert_called_once_with(obj, 2)
+
+
+class TestAdvisedAttributes(unittest.TestCase):
+    def tearDown(self):
+        for cls in (Plain, Slotted, WithProperty):
+            reset('{}.value'.format(cls.__name__))
+
+    def check_access(self, cls, access, expected):
+        calls = []
+
+        class DummyAspect(Aspect):
+            value = Pointcut('{}.value'.format(cls.__name__),
+                             target='properties', access=access)
+
+            @before('value')
+            def advice_func(cls, name, obj, *args):
+                calls.append((name,) + args)
+
+        obj = cls()
+        obj.value = 1
+        self.assertEqual(1, obj.value)
+        self.assertEqual(expected, calls)
+
+    def test_set(self):
+        for cls in (Plain, Slotted, WithProperty):
+            self.check_access(cls, 'set', [('value', 1)])
+            reset('{}.value'.format(cls.__name__))
+
+    def test_get(self):
+        for cls in (Plain, Slotted, WithProperty):
+            self.check_access(cls, 'get', [('value',)])
+            reset('{}.value'.format(cls.__name__))
+
+    def test_get_and_set(self):
+        for cls in (Plain, Slotted, WithProperty):
+            self.check_access(cls, 'all', [('value', 1), ('value',)])
+            reset('{}.value'.format(cls.__name__))
+
+    def test_value_stored_in_instance(self):
+        Pointcut('Plain.value', target='properties')
+        obj = Plain()
+        obj.value = 1
+        self.assertEqual({'value': 1}, vars(obj))
+        reset('Plain.value')
+        self.assertEqual(0, Plain.value)
+        self.assertEqual(1, obj.value)
+
+    def test_reset_slot(self):
+        slot = Slotted.value
+        Pointcut('Slotted.value', target='properties')
+        self.assertTrue(isinstance(Slotted.value, AdvisedAttribute))
+        reset('Slotted.value')
+        self.assertEqual(slot, Slotted.value)
+
+    def test_disable_swap(self):
+        pointcut = Pointcut('Plain.value', target='properties', access='all')
+        attribute = Plain.value
+        fget, fset = attribute.fget, attribute.fset
+        pointcut.disable(swap=True)
+        self.assertEqual((None, None), (attribute.fget, attribute.fset))
+        pointcut.enable()
+        self.assertEqual((fget, fset), (attribute.fget, attribute.fset))
@@ -0,0 +1,101 @@
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import unittest
+try:
+    from unittest import mock
+except ImportError:
+    import mock
+
+from easyaspect import Pattern, Pointcut, Predicate
+from easyaspect.advice import _Advice
+
+
+def exposed(func):
+    func.exposed = True
+    return func
+
+
+class Model(object):
+    def save(self):
+        pass
+
+    def save_all(self):
+        pass
+
+    @exposed
+    def load(self):
+        pass
+
+
+class ModelTest(Model):
+    def save(self):
+        pass
+
+
+class TestExpressions(unittest.TestCase):
+    def get_names(self, expression):
+        return [(cls.__name__, sorted(name for name, _ in members))
+                for cls, members in expression.get_members()]
+
+    def test_pattern(self):
+        self.assertEqual([('Model', ['save', 'save_all'])],
+                         self.get_names(Pattern('Model.save*')))
+
+    def test_pattern_with_module(self):
+        pattern = Pattern('{}.Model*.save'.format(__name__))
+        self.assertEqual([('Model', ['save']), ('ModelTest', ['save'])],
+                         self.get_names(pattern))
+
+    def test_invalid_pattern(self):
+        self.assertRaises(ValueError, Pattern, 'Model')
+
+    def test_and_not(self):
+        expression = Pattern('Model*.save') & ~Pattern('*Test.*')
+        self.assertEqual([('Model', ['save']), ('ModelTest', [])],
+                         self.get_names(expression))
+
+    def test_or_is_deduplicated(self):
+        expression = Pattern('Model.save*') | Pattern('Model.*all')
+        self.assertEqual([('Model', ['save', 'save_all'])],
+                         self.get_names(expression))
+
+    def test_predicate(self):
+        expression = Pattern('Model.*') & Predicate(
+            lambda cls, name, member: getattr(member, 'exposed', False))
+        self.assertEqual([('Model', ['load'])], self.get_names(expression))
+
+    def test_predicate_alone(self):
+        expression = ~Pattern('Model.*') | Predicate(lambda *args: True)
+        self.assertRaises(ValueError, expression.get_members)
+
+    def test_single_pass(self):
+        predicate = mock.Mock(return_value=True)
+        expression = (Pattern('Model.save*') | Pattern('Model.save')) & (
+            Predicate(predicate))
+        self.get_names(expression)
+        self.assertEqual(sorted([(Model, 'save', Model.save),
+                                 (Model, 'save_all', Model.save_all)]),
+                         sorted(call[0] for call in predicate.call_args_list))
+
+
+class TestPointcutExpressions(unittest.TestCase):
+    def tearDown(self):
+        self.pointcut.unweave()
+
+    def test_wrap_once(self):
+        calls = []
+        pointcut = self.pointcut = Pointcut(
+            Pattern('Model.save*') | Pattern('Model.save'), target='methods')
+        pointcut.add_advice(_Advice('before', pointcut, 'methods',
+                                    lambda *args: calls.append(args[1])))
+        self.assertEqual((pointcut,), Model.save._joinpoint.pointcuts)
+        Model().save()
+        self.assertEqual(['save'], calls)
+        self.assertFalse(hasattr(ModelTest.save, '_joinpoint'))
+
+    def test_overlapping_joinpoints(self):
+        pointcut = self.pointcut = Pointcut(['Model.save*', 'Model.save'],
+                                            target='methods')
+        self.assertEqual((pointcut,), Model.save._joinpoint.pointcuts)
@@ -0,0 +1,143 @@
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import unittest
+
+from easyaspect.advice import _Advice
+from easyaspect.guard import Guard, In
+from easyaspect.pointcut import Pointcut
+
+
+class Account(object):
+    def transfer(self, amount, currency='EUR'):
+        return amount
+
+    def update(self, **fields):
+        return fields
+
+    def count(self):
+        return 0
+
+
+class TestGuard(unittest.TestCase):
+    def test_gate(self):
+        calls = []
+
+        def advice(aspect, name, obj, value):
+            calls.append(value)
+
+        gate = Guard(lambda obj, value: value > 1).gate(advice, None)
+        for i in range(4):
+            gate('aspect', 'name', 'obj', i)
+        self.assertEqual([2, 3], calls)
+
+    def test_around_gate(self):
+        calls = []
+
+        def advice(aspect, name, next_, obj, value):
+            calls.append(value)
+            return next_(obj, value) * 10
+
+        gate = Guard(lambda obj, value: value % 2).gate(advice, None,
+                                                         around=True)
+        self.assertEqual([0, 10, 2, 30], [
+            gate('aspect', 'name', lambda obj, value: value, 'obj', i)
+            for i in range(4)])
+        self.assertEqual([1, 3], calls)
+
+    def test_returning_gate(self):
+        calls = []
+
+        def advice(aspect, name, ret, obj, value):
+            calls.append(ret)
+
+        gate = Guard(lambda obj, value: value).gate(advice, None,
+                                                    returning=True)
+        gate('aspect', 'name', 'first', 'obj', False)
+        gate('aspect', 'name', 'second', 'obj', True)
+        self.assertEqual(['second'], calls)
+
+
+class TestIn(unittest.TestCase):
+    def test_positional_and_keyword(self):
+        test = In('currency', ['USD']).compile(Account.transfer.im_func)
+        self.assertTrue(test('obj', 1, 'USD'))
+        self.assertTrue(test('obj', 1, currency='USD'))
+        self.assertFalse(test('obj', 1, 'EUR'))
+
+    def test_default(self):
+        test = In('currency', ['EUR']).compile(Account.transfer.im_func)
+        self.assertTrue(test('obj', 1))
+        test = In('amount', [None]).compile(Account.transfer.im_func)
+        self.assertFalse(test('obj'))
+
+    def test_position(self):
+        test = In(1, [5]).compile(None)
+        self.assertTrue(test('obj', 5))
+        self.assertFalse(test('obj', 6))
+        self.assertFalse(test('obj'))
+
+    def test_position_by_keyword(self):
+        test = In(1, [5]).compile(Account.transfer.im_func)
+        self.assertTrue(test('obj', amount=5))
+        self.assertFalse(test('obj', amount=6))
+
+    def test_position_default(self):
+        test = In(2, ['EUR']).compile(Account.transfer.im_func)
+        self.assertTrue(test('obj', 1))
+        self.assertTrue(test('obj', 1, currency='EUR'))
+        self.assertFalse(test('obj', 1, 'USD'))
+
+    def test_keyword_only(self):
+        test = In('name', ['a']).compile(Account.update.im_func)
+        self.assertTrue(test('obj', name='a'))
+        self.assertFalse(test('obj', other='a'))
+
+    def test_missing_argument(self):
+        test = In('spam', ['a']).compile(Account.transfer.im_func)
+        self.assertFalse(test('obj', 1, spam='a'))
+        test = In(3, ['a']).compile(Account.transfer.im_func, bound=True)
+        self.assertFalse(test({'self': 'obj', 'amount': 1}))
+
+
+class TestGuardedAdvice(unittest.TestCase):
+    def tearDown(self):
+        self.pointcut.unweave()
+
+    def test_guarded_advices(self):
+        calls = []
+
+        def before(aspect, name, obj, amount, currency='EUR'):
+            calls.append(('before', amount))
+
+        def around(aspect, name, next_, obj, amount, currency='EUR'):
+            calls.append(('around', amount))
+            return next_(obj, amount, currency) * 2
+
+        self.pointcut = pointcut = Pointcut('Account.transfer')
+        pointcut.add_advice(_Advice('before', pointcut, 'all', before,
+                                    guard=In('currency', ['USD'])))
+        pointcut.add_advice(_Advice(
+            'around', pointcut, 'all', around,
+            guard=Guard(lambda obj, amount, currency='EUR': amount > 5)))
+        account = Account()
+        self.assertEqual(1, account.transfer(1))
+        self.assertEqual(2, account.transfer(2, 'USD'))
+        self.assertEqual(20, account.transfer(10, currency='USD'))
+        self.assertEqual([('before', 2), ('around', 10), ('before', 10)],
+                         calls)
+
+    def test_joinpoint_without_argument(self):
+        calls = []
+
+        def before(aspect, name, obj, *args, **kwargs):
+            calls.append(name)
+
+        self.pointcut = pointcut = Pointcut('Account.*')
+        pointcut.add_advice(_Advice('before', pointcut, 'all', before,
+                                    guard=In('currency', ['USD'])))
+        account = Account()
+        self.assertEqual(0, account.count())
+        self.assertEqual(1, account.transfer(1, 'USD'))
+        self.assertEqual(['transfer'], calls)
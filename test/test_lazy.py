@@ -0,0 +1,73 @@
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import gc
+import shutil
+import tempfile
+import unittest
+import weakref
+from importlib import import_module
+
+from easyaspect.lazy import _weaver, defer, get_module_name
+from easyaspect.pointcut import Pointcut
+
+MODULE_SOURCE = '''
+class Target(object):
+    def method(self):
+        return 42
+'''
+
+
+class TestFunctions(unittest.TestCase):
+    def test_get_module_name(self):
+        self.assertEqual('pkg.module',
+                         get_module_name('pkg.module.Class.method'))
+        self.assertEqual('module', get_module_name('module.Class.*'))
+        self.assertEqual(None, get_module_name('Class.method'))
+
+    def test_defer_imported_module(self):
+        calls = []
+        defer('os', calls.append, 'arg')
+        self.assertEqual(['arg'], calls)
+
+
+class TestLazyWeaving(unittest.TestCase):
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+        with open(os.path.join(self.path, 'lazy_target.py'), 'w') as f:
+            f.write(MODULE_SOURCE)
+        sys.path.insert(0, self.path)
+
+    def tearDown(self):
+        sys.path.remove(self.path)
+        sys.modules.pop('lazy_target', None)
+        shutil.rmtree(self.path)
+
+    def test_weave_on_import(self):
+        Pointcut('lazy_target.Target.method', lazy=True)
+        self.assertFalse('lazy_target' in sys.modules)
+        module = import_module('lazy_target')
+        self.assertTrue(hasattr(module.Target.method, '_joinpoint'))
+        self.assertEqual(42, module.Target().method())
+        self.assertFalse(_weaver in sys.meta_path)
+
+    def test_not_lazy(self):
+        Pointcut('lazy_target.Target.method')
+        self.assertTrue('lazy_target' in sys.modules)
+
+    def test_unweave_pending(self):
+        pointcut = Pointcut('lazy_target.Target.method', lazy=True)
+        pointcut.unweave()
+        module = import_module('lazy_target')
+        self.assertFalse(hasattr(module.Target.method, '_joinpoint'))
+
+    def test_unweave_pending_releases_pointcut(self):
+        pointcut = Pointcut('lazy_target.Target.method', lazy=True)
+        self.assertTrue(_weaver in sys.meta_path)
+        pointcut.unweave()
+        self.assertFalse(_weaver in sys.meta_path)
+        ref = weakref.ref(pointcut)
+        del pointcut
+        gc.collect()
+        self.assertTrue(ref() is None)
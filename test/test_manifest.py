@@ -0,0 +1,131 @@
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import shutil
+import tempfile
+import unittest
+from importlib import import_module
+try:
+    from unittest import mock
+except ImportError:
+    import mock
+
+from easyaspect import manifest
+from easyaspect.manifest import Manifest
+from easyaspect.utils import get_methods
+
+MODULE_SOURCE = '''
+class Target(object):
+    def method(self):
+        return 42
+
+    def another_method(self):
+        return 0
+'''
+
+
+class TestManifest(unittest.TestCase):
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+        self.module_path = os.path.join(self.path, 'manifest_target.py')
+        self.manifest_path = os.path.join(self.path, 'manifest.json')
+        self.write_module(MODULE_SOURCE)
+        sys.path.insert(0, self.path)
+        self.module = import_module('manifest_target')
+
+    def tearDown(self):
+        sys.path.remove(self.path)
+        sys.modules.pop('manifest_target', None)
+        sys.modules.pop('manifest_base', None)
+        shutil.rmtree(self.path)
+
+    def write_module(self, source):
+        with open(self.module_path, 'w') as f:
+            f.write(source)
+
+    def resolve(self, joinpoint='manifest_target.Target.*method'):
+        resolver = mock.Mock(side_effect=get_methods)
+        members = Manifest(self.manifest_path).resolve(
+            joinpoint, 'methods', resolver)
+        return members, resolver.called
+
+    def save(self, joinpoint='manifest_target.Target.*method'):
+        saved = Manifest(self.manifest_path)
+        members = saved.resolve(joinpoint, 'methods', get_methods)
+        saved.save()
+        return members
+
+    def test_resolve_from_manifest(self):
+        expected = self.save()
+        self.assertEqual(2, len(expected[0][1]))
+        members, resolved = self.resolve()
+        self.assertFalse(resolved)
+        self.assertEqual(expected, members)
+        self.assertEqual(str, type(members[0][1][0][0]))
+
+    def test_changed_module(self):
+        self.save()
+        self.write_module(MODULE_SOURCE + '\n    def third_method(self):\n'
+                          '        pass\n')
+        members, resolved = self.resolve()
+        self.assertTrue(resolved)
+
+    def test_touched_module(self):
+        self.save()
+        stat = os.stat(self.module_path)
+        os.utime(self.module_path, (stat.st_atime, stat.st_mtime + 10))
+        members, resolved = self.resolve()
+        self.assertFalse(resolved)
+
+    def test_touched_module_hashed_once(self):
+        self.save()
+        stat = os.stat(self.module_path)
+        os.utime(self.module_path, (stat.st_atime, stat.st_mtime + 10))
+        self.save()
+        with mock.patch('easyaspect.manifest._hash') as mocked_hash:
+            members, resolved = self.resolve()
+        self.assertFalse(resolved)
+        self.assertFalse(mocked_hash.called)
+
+    def test_changed_base_module(self):
+        base_path = os.path.join(self.path, 'manifest_base.py')
+        with open(base_path, 'w') as f:
+            f.write(MODULE_SOURCE.replace('Target', 'Base'))
+        self.write_module('from manifest_base import Base\n\n\n'
+                          'class Child(Base):\n    pass\n')
+        reload(self.module)
+        self.save('manifest_target.Child.*method')
+        self.assertFalse(self.resolve('manifest_target.Child.*method')[1])
+        with open(base_path, 'a') as f:
+            f.write('\n    def third_method(self):\n        pass\n')
+        members, resolved = self.resolve('manifest_target.Child.*method')
+        self.assertTrue(resolved)
+
+    def test_missing_member(self):
+        self.save()
+        del self.module.Target.another_method
+        members, resolved = self.resolve()
+        self.assertTrue(resolved)
+
+    def test_not_cached(self):
+        self.save('Target.method')
+        self.assertFalse(os.path.exists(self.manifest_path))
+
+    def test_use(self):
+        with mock.patch.object(manifest, '_manifest', [None]), \
+                mock.patch('easyaspect.manifest.atexit') as mocked_atexit:
+            used = manifest.use(self.manifest_path)
+            mocked_atexit.register.assert_called_once_with(manifest.save)
+            resolver = mock.Mock(return_value=[])
+            self.assertEqual([], manifest.resolve(
+                'manifest_target.Missing.*', 'methods', resolver))
+            self.assertTrue(used.changed)
+            manifest.save()
+            self.assertTrue(os.path.exists(self.manifest_path))
+
+    def test_resolve_without_manifest(self):
+        resolver = mock.Mock(return_value=[])
+        with mock.patch.object(manifest, '_manifest', [None]):
+            manifest.resolve('pkg.Class.method', 'methods', resolver)
+        resolver.assert_called_once_with('pkg.Class.method')
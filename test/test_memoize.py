@@ -0,0 +1,223 @@
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import threading
+import time
+import unittest
+try:
+    from unittest import mock
+except ImportError:
+    import mock
+
+from easyaspect import Pointcut
+from easyaspect.memoize import Cache, MemoizeAspect
+
+
+class Repository(object):
+    def __init__(self):
+        self.reads = []
+
+    def read(self, page):
+        self.reads.append(page)
+        return page.upper()
+
+
+class Users(object):
+    def read(self, id):
+        return 'user{}'.format(id)
+
+
+class Orders(object):
+    def read(self, id):
+        return 'order{}'.format(id)
+
+
+class TestCache(unittest.TestCase):
+    def test_hit(self):
+        cache = Cache()
+        func = mock.Mock(return_value=1)
+        self.assertEqual(1, cache.get('key', func, 'arg'))
+        self.assertEqual(1, cache.get('key', func, 'arg'))
+        func.assert_called_once_with('arg')
+        self.assertEqual({'hits': 1, 'misses': 1, 'evictions': 0,
+                          'size': 1}, cache.info())
+
+    def test_lru(self):
+        cache = Cache(maxsize=2)
+        cache.get('a', lambda: 1)
+        cache.get('b', lambda: 2)
+        cache.get('a', lambda: 3)
+        cache.get('c', lambda: 4)
+        self.assertEqual(1, cache.get('a', lambda: 5))
+        self.assertEqual(6, cache.get('b', lambda: 6))
+        self.assertEqual(2, cache.info()['evictions'])
+
+    @mock.patch('easyaspect.memoize.clock')
+    def test_ttl(self, mocked_clock):
+        mocked_clock.return_value = 0
+        cache = Cache(ttl=10)
+        cache.get('a', lambda: 1)
+        mocked_clock.return_value = 9
+        self.assertEqual(1, cache.get('a', lambda: 2))
+        mocked_clock.return_value = 10
+        self.assertEqual(3, cache.get('a', lambda: 3))
+        self.assertEqual(1, cache.info()['evictions'])
+
+    def test_errors_are_not_cached(self):
+        cache = Cache()
+        self.assertRaises(ZeroDivisionError, cache.get, 'a', lambda: 1 / 0)
+        self.assertEqual(1, cache.get('a', lambda: 1))
+
+    def test_invalidate(self):
+        cache = Cache()
+        cache.get('a', lambda: 1)
+        cache.get('b', lambda: 2)
+        cache.invalidate('a')
+        self.assertEqual(3, cache.get('a', lambda: 3))
+        self.assertEqual(2, cache.get('b', lambda: 4))
+        cache.invalidate()
+        self.assertEqual(0, cache.info()['size'])
+
+    def test_single_flight(self):
+        cache = Cache()
+        started = threading.Event()
+        calls = []
+        results = []
+
+        def func():
+            calls.append(1)
+            started.set()
+            time.sleep(0.05)
+            return 'value'
+
+        def get():
+            results.append(cache.get('a', func))
+
+        threads = [threading.Thread(target=get) for i in range(5)]
+        threads[0].start()
+        started.wait()
+        for thread in threads[1:]:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(1, len(calls))
+        self.assertEqual(['value'] * 5, results)
+
+    def test_single_flight_error(self):
+        cache = Cache()
+        started = threading.Event()
+        errors = []
+
+        def func():
+            started.set()
+            time.sleep(0.05)
+            raise ValueError
+
+        def get():
+            try:
+                cache.get('a', func)
+            except ValueError:
+                errors.append(1)
+
+        threads = [threading.Thread(target=get) for i in range(3)]
+        threads[0].start()
+        started.wait()
+        for thread in threads[1:]:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(3, len(errors))
+
+
+class TestMemoizeAspect(unittest.TestCase):
+    def tearDown(self):
+        self.aspect.unweave()
+
+    def test_per_instance(self):
+
+        class ReadCache(MemoizeAspect):
+            memoized = Pointcut('Repository.read')
+
+        self.aspect = ReadCache
+        repo, another_repo = Repository(), Repository()
+        self.assertEqual('A', repo.read('a'))
+        self.assertEqual('A', repo.read('a'))
+        self.assertEqual('A', another_repo.read('a'))
+        self.assertEqual(['a'], repo.reads)
+        self.assertEqual(['a'], another_repo.reads)
+        self.assertEqual({'Repository.read': {'hits': 1, 'misses': 2,
+                                              'evictions': 0, 'size': 2}},
+                         ReadCache.counters())
+
+    def test_per_class(self):
+
+        class ReadCache(MemoizeAspect):
+            memoized = Pointcut('Repository.read')
+            per_instance = False
+
+        self.aspect = ReadCache
+        repo, another_repo = Repository(), Repository()
+        repo.read('a')
+        another_repo.read('a')
+        self.assertEqual([], another_repo.reads)
+
+    def test_key(self):
+
+        class ReadCache(MemoizeAspect):
+            memoized = Pointcut('Repository.read')
+            key = staticmethod(lambda obj, page: page.lower())
+
+        self.aspect = ReadCache
+        repo = Repository()
+        repo.read('a')
+        repo.read('A')
+        self.assertEqual(['a'], repo.reads)
+
+    def test_invalidate(self):
+
+        class ReadCache(MemoizeAspect):
+            memoized = Pointcut('Repository.read')
+
+        self.aspect = ReadCache
+        repo = Repository()
+        repo.read('a')
+        repo.read('b')
+        ReadCache.invalidate('read', repo, 'a')
+        repo.read('a')
+        repo.read('b')
+        self.assertEqual(['a', 'b', 'a'], repo.reads)
+        ReadCache.invalidate()
+        repo.read('b')
+        self.assertEqual(['a', 'b', 'a', 'b'], repo.reads)
+
+    def test_separate_caches(self):
+
+        class ReadCache(MemoizeAspect):
+            memoized = Pointcut('Repository.read')
+            maxsize = 1
+
+        class AnotherCache(MemoizeAspect):
+            pass
+
+        self.aspect = ReadCache
+        Repository().read('a')
+        self.assertEqual(1, ReadCache.get_cache('read').maxsize)
+        self.assertEqual({}, AnotherCache.counters())
+
+    def test_same_name_in_classes(self):
+
+        class ReadCache(MemoizeAspect):
+            memoized = Pointcut(['Users.read', 'Orders.read'])
+            key = staticmethod(lambda obj, id: id)
+
+        self.aspect = ReadCache
+        self.assertEqual('user1', Users().read(1))
+        self.assertEqual('order1', Orders().read(1))
+        self.assertEqual(['Orders.read', 'Users.read'],
+                         sorted(ReadCache.counters()))
+        ReadCache.invalidate('Users.read')
+        self.assertEqual(0, ReadCache.counters()['Users.read']['size'])
+        self.assertEqual(1, ReadCache.counters()['Orders.read']['size'])
+        ReadCache.invalidate('read')
+        self.assertEqual(0, ReadCache.counters()['Orders.read']['size'])
@@ -0,0 +1,173 @@
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import cPickle
+import threading
+import unittest
+try:
+    from unittest import mock
+except ImportError:
+    import mock
+
+from easyaspect import Pointcut
+from easyaspect.offload import OffloadAspect, PROCESS, futures
+
+
+class Model(object):
+    def compute(self, a):
+        return a * 2
+
+
+class SubModel(Model):
+    def compute(self, a):
+        return super(SubModel, self).compute(a)
+
+
+class FakeFuture(object):
+    def __init__(self, result):
+        self._result = result
+
+    def result(self, timeout=None):
+        return self._result
+
+    def add_done_callback(self, func):
+        func(self)
+
+
+class FakeExecutor(object):
+    """Runs the calls immediately, recording them."""
+    def __init__(self, pool, max_workers):
+        self.pool = pool
+        self.max_workers = max_workers
+        self.calls = []
+
+    def submit(self, func, *args, **kwargs):
+        self.calls.append(args)
+        return FakeFuture(func(*args, **kwargs))
+
+    def shutdown(self, wait=True):
+        pass
+
+
+@mock.patch('easyaspect.offload._make_executor', FakeExecutor)
+class TestOffloadAspect(unittest.TestCase):
+    def tearDown(self):
+        self.aspect.unweave()
+        self.aspect.shutdown()
+
+    def test_thread_pool(self):
+
+        class Offloaded(OffloadAspect):
+            offloaded = Pointcut('Model.compute')
+            max_workers = 2
+
+        self.aspect = Offloaded
+        self.assertEqual(4, Model().compute(2).result())
+        executors = Offloaded.get_pool().executors
+        self.assertEqual(1, len(executors))
+        self.assertEqual(('thread', 2), (executors[0].pool,
+                                         executors[0].max_workers))
+
+    def test_pinned(self):
+
+        class Offloaded(OffloadAspect):
+            offloaded = Pointcut('Model.compute')
+            max_workers = 3
+            key = staticmethod(lambda obj, a: a)
+
+        self.aspect = Offloaded
+        model = Model()
+        for a in (1, 2, 1, 4):
+            model.compute(a)
+        executors = Offloaded.get_pool().executors
+        self.assertEqual([1] * 3, [executor.max_workers
+                                   for executor in executors])
+        calls = executors[hash(1) % 3].calls
+        self.assertEqual(2, len([call for call in calls if call[1] == 1]))
+
+    def test_process_pool(self):
+
+        class Offloaded(OffloadAspect):
+            offloaded = Pointcut('Model.compute')
+            pool = PROCESS
+
+        self.aspect = Offloaded
+        model = Model()
+        self.assertEqual(6, model.compute(3).result())
+        executor = Offloaded.get_pool().executors[0]
+        self.assertEqual('process', executor.pool)
+        # The original function is called by name, pickled once
+        self.assertEqual(1, len(executor.calls))
+        cls, name, obj, args, kwargs = cPickle.loads(executor.calls[0][0])
+        self.assertEqual((Model, 'compute', (3,), {}), (cls, name, args,
+                                                         kwargs))
+        self.assertEqual(str, type(name))
+
+    def test_process_pool_super(self):
+
+        class Offloaded(OffloadAspect):
+            offloaded = Pointcut('Model.compute')
+            pool = PROCESS
+
+        self.aspect = Offloaded
+        # The original function of the advised class, not the override
+        self.assertEqual(4, SubModel().compute(2).result())
+
+    def test_process_pool_not_picklable(self):
+
+        class Offloaded(OffloadAspect):
+            offloaded = Pointcut('Model.compute')
+            pool = PROCESS
+
+        self.aspect = Offloaded
+        self.assertRaises(TypeError, Model().compute, threading.Lock())
+
+    def test_invalid_pool(self):
+
+        class Offloaded(OffloadAspect):
+            offloaded = Pointcut('Model.compute')
+            pool = 'spam'
+
+        self.aspect = Offloaded
+        self.assertRaises(ValueError, Model().compute, 1)
+
+    def test_bounded(self):
+
+        class Offloaded(OffloadAspect):
+            offloaded = Pointcut('Model.compute')
+            max_pending = 1
+
+        self.aspect = Offloaded
+        model = Model()
+        # The semaphore is released when each call is done
+        self.assertEqual([2, 4], [model.compute(a).result()
+                                  for a in (1, 2)])
+
+
+@unittest.skipIf(futures is None, 'concurrent.futures not installed')
+class TestOffloadAspectWithFutures(unittest.TestCase):
+    def tearDown(self):
+        self.aspect.unweave()
+        self.aspect.shutdown()
+
+    def test_thread_pool(self):
+
+        class Offloaded(OffloadAspect):
+            offloaded = Pointcut('Model.compute')
+
+        self.aspect = Offloaded
+        self.assertEqual(4, Model().compute(2).result(5))
+
+    def test_process_pool(self):
+
+        class Offloaded(OffloadAspect):
+            offloaded = Pointcut('Model.compute')
+            pool = PROCESS
+            max_workers = 2
+
+        self.aspect = Offloaded
+        # The worker runs the original function, returning the value
+        # instead of another future
+        self.assertEqual(6, Model().compute(3).result(30))
+        self.assertEqual(4, SubModel().compute(2).result(30))
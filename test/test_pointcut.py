@@ -2,14 +2,21 @@ import os
 import sys
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
 
+import gc
+import pickle
+import threading
+import time
 import unittest
+import weakref
 try:
     from unittest import mock
 except ImportError:
     import mock
 
-from easyaspect.pointcut import Pointcut, get_original, reset
+from easyaspect.pointcut import (JoinpointName, Pointcut, get_original,
+                                 reset, unweave_all)
 from easyaspect.advice import _Advice
+from easyaspect.descriptor import AdvisedAttribute
 
 
 class TestFunctions(unittest.TestCase):
@@ -24,6 +31,16 @@ class TestFunctions(unittest.TestCase):
         orig = get_original(wrapped)
         self.assertEqual(func, orig)
 
+    def test_joinpoint_name(self):
+        name = JoinpointName('method', DummyClass)
+        self.assertEqual('method', name)
+        self.assertEqual(DummyClass, name.owner)
+        self.assertEqual('DummyClass.method', name.label)
+        unpickled = pickle.loads(pickle.dumps(name))
+        self.assertEqual((str, 'method'), (type(unpickled), unpickled))
+        self.assertEqual((None, 'func'), (JoinpointName('func').owner,
+                                          JoinpointName('func').label))
+
 
 class DummyClass:
     prop = 42
@@ -63,7 +80,7 @@ class TestPointcut(unittest.TestCase):
         self.assertTrue(isinstance(DummyClass.prop, int))
         Pointcut(['DummyClass.*'], target='properties')
         self.assertEqual(DummyClass.method, self.orig_method)
-        self.assertTrue(isinstance(DummyClass.prop, property))
+        self.assertTrue(isinstance(DummyClass.prop, AdvisedAttribute))
 
     def test_get_advices(self):
         pointcut = Pointcut(['DummyClass.*'])
@@ -105,6 +122,50 @@ class TestPointcut(unittest.TestCase):
         self.assertEqual({'after': [], 'before': [a1], 'around': [a2]},
                          pointcut.advices)
 
+    def test_advices_snapshot(self):
+        pointcut = Pointcut(['DummyClass.*'])
+        a1 = _Advice('before', pointcut, 'all', DummyClass.method)
+        pointcut.add_advice(a1)
+        advices = pointcut.advices
+        self.assertTrue(advices is pointcut.advices)
+        a2 = _Advice('after', pointcut, 'all', lambda a: a)
+        pointcut.add_advice(a2)
+        self.assertFalse(advices is pointcut.advices)
+        advices = pointcut.advices
+        pointcut.disable('method')
+        self.assertFalse(advices is pointcut.advices)
+        self.assertEqual({'after': [a2], 'before': [], 'around': []},
+                         pointcut.advices)
+
+    def test_disable_swap(self):
+        pointcut = Pointcut(['DummyClass.method'])
+        advised_method = DummyClass.method
+        self.assertNotEqual(self.orig_method, advised_method)
+        pointcut.disable(swap=True)
+        self.assertEqual(self.orig_method, DummyClass.method)
+        pointcut.enable()
+        self.assertEqual(advised_method, DummyClass.method)
+
+    def test_disable_swap_shared_joinpoint(self):
+        pointcut = Pointcut(['DummyClass.method'])
+        another_pointcut = Pointcut(['DummyClass.method'])
+        advised_method = DummyClass.method
+        pointcut.disable(swap=True)
+        self.assertEqual(advised_method, DummyClass.method)
+        another_pointcut.disable(swap=True)
+        self.assertEqual(self.orig_method, DummyClass.method)
+        another_pointcut.enable()
+        self.assertEqual(advised_method, DummyClass.method)
+        self.assertEqual(3, DummyClass().method(1, 2))
+
+    def test_disable_swap_property(self):
+        pointcut = Pointcut(['DummyClass.prop'])
+        prop = vars(DummyClass)['prop']
+        pointcut.disable(swap=True)
+        self.assertFalse(hasattr(vars(DummyClass)['prop'].fset, '_joinpoint'))
+        pointcut.enable()
+        self.assertEqual(prop, vars(DummyClass)['prop'])
+
     def test_reset_string(self):
         self.assertEqual(DummyClass.method, self.orig_method)
         Pointcut(['DummyClass.*'])
@@ -118,3 +179,301 @@ class TestPointcut(unittest.TestCase):
         self.assertNotEqual(DummyClass.method, self.orig_method)
         reset(DummyClass.method)
         self.assertEqual(DummyClass.method, self.orig_method)
+
+
+class TestAdvisedFunction(unittest.TestCase):
+    def setUp(self):
+        self.calls = []
+
+        class Dummy(object):
+            def method(self, a):
+                return a
+
+        self.Dummy = Dummy
+        self.pointcut = Pointcut(Dummy.method)
+        self.pointcut.aspect = 'aspect'
+
+    def add_advice(self, type, name):
+        calls = self.calls
+
+        def before(aspect, joinpoint, obj, a):
+            calls.append((name, aspect, joinpoint, a))
+
+        def around(aspect, joinpoint, next_, obj, a):
+            calls.append((name, aspect, joinpoint, a))
+            return next_(obj, a)
+
+        func = around if type == 'around' else before
+        func.__name__ = name
+        self.pointcut.add_advice(_Advice(type, self.pointcut, 'all', func))
+
+    def test_run_advices(self):
+        self.add_advice('before', 'b')
+        self.add_advice('after', 'a')
+        self.add_advice('around', 'r')
+        self.assertEqual(1, self.Dummy().method(1))
+        self.assertEqual([('r', 'aspect', 'method', 1),
+                          ('b', 'aspect', 'method', 1),
+                          ('a', 'aspect', 'method', 1)], self.calls)
+
+    def test_around_order(self):
+        self.add_advice('around', 'r1')
+        self.add_advice('around', 'r2')
+        self.Dummy().method(1)
+        self.assertEqual(['r2', 'r1'], [call[0] for call in self.calls])
+
+    def test_chain_is_reused(self):
+        self.add_advice('before', 'b')
+        joinpoint = self.Dummy.method._joinpoint
+        self.Dummy().method(1)
+        chain = joinpoint.chain
+        self.Dummy().method(1)
+        self.assertTrue(chain is joinpoint.chain)
+
+    def test_chain_is_rebuilt(self):
+        self.Dummy().method(1)
+        self.add_advice('before', 'b')
+        self.Dummy().method(1)
+        self.assertEqual(1, len(self.calls))
+        self.pointcut.disable('b')
+        self.Dummy().method(1)
+        self.assertEqual(1, len(self.calls))
+        self.pointcut.enable()
+        self.Dummy().method(1)
+        self.assertEqual(2, len(self.calls))
+
+    def test_new_pointcut_rebuilds_chain(self):
+        self.Dummy().method(1)
+        pointcut = Pointcut(self.Dummy.method)
+
+        def before(aspect, joinpoint, obj, a):
+            self.calls.append(a)
+
+        pointcut.add_advice(_Advice('before', pointcut, 'all', before))
+        self.Dummy().method(1)
+        self.assertEqual([1], self.calls)
+
+    def test_inherited_method(self):
+
+        class Child(self.Dummy):
+            pass
+
+        Pointcut(Child.method)
+        self.add_advice('before', 'b')
+        self.assertTrue(Child.method._joinpoint.inherited)
+        self.assertEqual(2, Child().method(2))
+        self.assertEqual([('b', 'aspect', 'method', 2)], self.calls)
+
+    def test_inherited_chain_cached_per_class(self):
+
+        class Child(self.Dummy):
+            pass
+
+        class GrandChild(Child):
+            pass
+
+        Pointcut(Child.method)
+        self.add_advice('before', 'b')
+        joinpoint = Child.method._joinpoint
+        Child().method(1)
+        GrandChild().method(1)
+        self.assertEqual(2, len(joinpoint.chains))
+        chain = joinpoint.chains[id(Child)]
+        Child().method(1)
+        self.assertTrue(chain is joinpoint.chains[id(Child)])
+        reset(self.Dummy.method)
+        Child().method(1)
+        self.assertFalse(chain is joinpoint.chains[id(Child)])
+        self.assertEqual(3, len(self.calls))
+
+    def test_inherited_chain_does_not_keep_class_alive(self):
+
+        class Child(self.Dummy):
+            pass
+
+        Pointcut(Child.method)
+        joinpoint = Child.method._joinpoint
+
+        class GrandChild(Child):
+            pass
+
+        GrandChild().method(1)
+        self.assertEqual(1, len(joinpoint.chains))
+        del GrandChild
+        gc.collect()
+        self.assertEqual(0, len(joinpoint.chains))
+
+    def test_disable_swap_inherited_method(self):
+
+        class Child(self.Dummy):
+            pass
+
+        pointcut = Pointcut(Child.method)
+        self.add_advice('before', 'b')
+        pointcut.disable(swap=True)
+        self.assertFalse('method' in vars(Child))
+        Child().method(1)
+        self.assertEqual([('b', 'aspect', 'method', 1)], self.calls)
+        pointcut.enable()
+        self.assertTrue('method' in vars(Child))
+
+
+class AttributeDummy(object):
+    value = 0
+
+
+class TestUnweave(unittest.TestCase):
+    def setUp(self):
+
+        class Dummy(object):
+            value = 0
+
+            def method(self, a):
+                return a
+
+        class Child(Dummy):
+            pass
+
+        self.Dummy, self.Child = Dummy, Child
+        self.method = vars(Dummy)['method']
+
+    def test_unweave(self):
+        pointcut = Pointcut([self.Dummy.method, self.Child.method])
+        pointcut.unweave()
+        self.assertTrue(vars(self.Dummy)['method'] is self.method)
+        self.assertFalse('method' in vars(self.Child))
+        self.assertEqual(0, len(pointcut._sites))
+
+    def test_unweave_shared_joinpoint(self):
+        pointcut = Pointcut(self.Dummy.method)
+        another_pointcut = Pointcut(self.Dummy.method)
+        advised_method = vars(self.Dummy)['method']
+        pointcut.unweave()
+        self.assertTrue(vars(self.Dummy)['method'] is advised_method)
+        self.assertEqual((another_pointcut,),
+                         advised_method._joinpoint.pointcuts)
+        another_pointcut.unweave()
+        self.assertTrue(vars(self.Dummy)['method'] is self.method)
+
+    def test_unweave_swapped(self):
+        pointcut = Pointcut(self.Dummy.method)
+        pointcut.disable(swap=True)
+        pointcut.unweave()
+        pointcut.enable()
+        self.assertTrue(vars(self.Dummy)['method'] is self.method)
+
+    def test_unweave_attribute(self):
+        pointcut = Pointcut('AttributeDummy.value', target='properties',
+                            access='all')
+        self.assertTrue(isinstance(vars(AttributeDummy)['value'],
+                                   AdvisedAttribute))
+        pointcut.unweave()
+        self.assertEqual(0, vars(AttributeDummy)['value'])
+
+    def test_unweave_inherited_attribute(self):
+        pointcut = Pointcut(self.Child, target='properties', access='all')
+        self.assertTrue(isinstance(vars(self.Child)['value'],
+                                   AdvisedAttribute))
+        pointcut.unweave()
+        self.assertFalse('value' in vars(self.Child))
+        self.Dummy.value = 5
+        self.assertEqual(5, self.Child.value)
+
+    def test_unweave_all(self):
+        Pointcut(self.Dummy.method)
+        Pointcut(self.Child.method)
+        unweave_all()
+        self.assertTrue(vars(self.Dummy)['method'] is self.method)
+        self.assertFalse('method' in vars(self.Child))
+
+
+class TestMemory(unittest.TestCase):
+    def test_woven_classes_are_collected(self):
+        calls = []
+
+        def create_class():
+            class Generated(object):
+                def method(self):
+                    # References the class from a closure
+                    return Generated
+
+            return Generated
+
+        classes = [create_class() for i in range(10000)]
+        refs = [weakref.ref(cls) for cls in classes]
+        pointcut = Pointcut([cls.method for cls in classes])
+        pointcut.add_advice(_Advice('before', pointcut, 'all',
+                                    lambda *args: calls.append(args)))
+        self.assertEqual(10000, len(pointcut._sites))
+        for cls in classes[:10]:
+            self.assertTrue(cls().method() is cls)
+        self.assertEqual(10, len(calls))
+        del classes, cls, calls[:]
+        gc.collect()
+        self.assertEqual([], [ref for ref in refs if ref() is not None])
+        self.assertEqual(0, len(pointcut._sites))
+
+
+class TestConcurrency(unittest.TestCase):
+    def test_toggle_while_calling(self):
+
+        class Dummy(object):
+            def method(self, a):
+                return a
+
+        class Child(Dummy):
+            pass
+
+        counter = []
+
+        def before(aspect, joinpoint, obj, a):
+            counter.append(a)
+
+        def around(aspect, joinpoint, next_, obj, a):
+            return next_(obj, a)
+
+        pointcut = Pointcut([Dummy.method, Child.method])
+        pointcut.add_advice(_Advice('before', pointcut, 'all', before))
+        another_pointcut = Pointcut(Dummy.method)
+        another_pointcut.add_advice(
+            _Advice('around', another_pointcut, 'all', around))
+        errors = []
+        stop = threading.Event()
+
+        def call():
+            try:
+                while not stop.is_set():
+                    for obj in (Dummy(), Child()):
+                        if obj.method(1) != 1:
+                            errors.append('wrong result')
+            except Exception as e:
+                errors.append(e)
+
+        def toggle():
+            try:
+                while not stop.is_set():
+                    pointcut.disable()
+                    another_pointcut.disable(swap=True)
+                    pointcut.disable(swap=True)
+                    pointcut.enable()
+                    another_pointcut.disable('around')
+                    another_pointcut.enable()
+                    pointcut.disable('before')
+                    pointcut.enable()
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=call) for i in range(8)]
+        threads += [threading.Thread(target=toggle) for i in range(2)]
+        for thread in threads:
+            thread.start()
+        time.sleep(0.5)
+        stop.set()
+        for thread in threads:
+            thread.join()
+        self.assertEqual([], errors)
+        # All changes are seen once the toggling stops
+        del counter[:]
+        Dummy().method(1)
+        Child().method(2)
+        self.assertEqual([1, 2], counter)
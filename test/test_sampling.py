@@ -0,0 +1,172 @@
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import unittest
+try:
+    from unittest import mock
+except ImportError:
+    import mock
+
+from easyaspect.advice import _Advice
+from easyaspect.pointcut import Pointcut
+from easyaspect.sampling import Every, Rate, PerSecond
+
+
+class TestEvery(unittest.TestCase):
+    def test_gate(self):
+        calls = []
+        gate = Every(3).gate(calls.append)
+        for i in range(7):
+            gate(i)
+        self.assertEqual([0, 3, 6], calls)
+
+    def test_around_gate(self):
+        calls = []
+
+        def advice(aspect, name, next_, value):
+            calls.append(value)
+            return next_(value)
+
+        gate = Every(2).gate(advice, around=True)
+        self.assertEqual([1, 2, 3], [gate('aspect', 'name', lambda a: a, i)
+                                     for i in range(1, 4)])
+        self.assertEqual([1, 3], calls)
+
+    def test_gates_with_different_keys(self):
+        calls = []
+        policy = Every(2)
+        first = policy.gate(lambda i: calls.append(('first', i)), key=1)
+        second = policy.gate(lambda i: calls.append(('second', i)), key=2)
+        for i in range(3):
+            first(i)
+            second(i)
+        self.assertEqual([('first', 0), ('second', 0), ('first', 2),
+                          ('second', 2)], calls)
+
+    def test_invalid(self):
+        self.assertRaises(ValueError, Every, 0)
+
+
+class TestRate(unittest.TestCase):
+    def test_all_calls(self):
+        calls = []
+        gate = Rate(1).gate(calls.append)
+        for i in range(5):
+            gate(i)
+        self.assertEqual(range(5), calls)
+
+    @mock.patch('easyaspect.sampling.random.random')
+    def test_skip_from_geometric_distribution(self, mocked_random):
+        # 1 - 0.75 = 0.5 ** 2, skips two calls between runs
+        mocked_random.return_value = 0.75
+        calls = []
+        gate = Rate(0.5).gate(calls.append)
+        for i in range(7):
+            gate(i)
+        self.assertEqual([2, 5], calls)
+
+    def test_invalid(self):
+        self.assertRaises(ValueError, Rate, 0)
+        self.assertRaises(ValueError, Rate, 1.5)
+
+
+class TestPerSecond(unittest.TestCase):
+    @mock.patch('easyaspect.sampling.clock')
+    def test_gate(self, mocked_clock):
+        mocked_clock.return_value = 0
+        calls = []
+        gate = PerSecond(2).gate(calls.append)
+        for i in range(4):
+            gate(i)
+        self.assertEqual([0, 1], calls)
+        mocked_clock.return_value = 0.5
+        gate(4)
+        gate(5)
+        self.assertEqual([0, 1, 4], calls)
+
+    @mock.patch('easyaspect.sampling.clock')
+    def test_bucket_shared_by_gates(self, mocked_clock):
+        mocked_clock.return_value = 0
+        calls = []
+        policy = PerSecond(2)
+        policy.gate(calls.append)(0)
+        policy.gate(calls.append)(1)
+        policy.gate(calls.append)(2)
+        self.assertEqual([0, 1], calls)
+
+    def test_invalid(self):
+        self.assertRaises(ValueError, PerSecond, 0)
+
+
+class TestSampledAdvice(unittest.TestCase):
+    def test_sampled_before(self):
+
+        class Dummy(object):
+            def method(self, a):
+                return a
+
+        calls = []
+
+        def advice(aspect, name, obj, a):
+            calls.append(a)
+
+        pointcut = Pointcut(Dummy.method)
+        pointcut.add_advice(_Advice('before', pointcut, 'all', advice,
+                                    Every(2)))
+        self.assertEqual([0, 1, 2, 3], [Dummy().method(i) for i in range(4)])
+        self.assertEqual([0, 2], calls)
+
+    def test_policy_shared_by_advices(self):
+
+        class Dummy(object):
+            def method(self, a):
+                return a
+
+            def other(self, a):
+                return a
+
+        calls = []
+
+        def before_advice(aspect, name, obj, a):
+            calls.append(('before', name, a))
+
+        def after_advice(aspect, name, obj, a):
+            calls.append(('after', name, a))
+
+        policy = Every(2)
+        pointcut = Pointcut([Dummy.method, Dummy.other])
+        pointcut.add_advice(_Advice('before', pointcut, 'all', before_advice,
+                                    policy))
+        pointcut.add_advice(_Advice('after', pointcut, 'all', after_advice,
+                                    policy))
+        dummy = Dummy()
+        for i in range(3):
+            dummy.method(i)
+            dummy.other(i)
+        self.assertEqual(
+            [('before', 'method', 0), ('after', 'method', 0),
+             ('before', 'other', 0), ('after', 'other', 0),
+             ('before', 'method', 2), ('after', 'method', 2),
+             ('before', 'other', 2), ('after', 'other', 2)], calls)
+
+    def test_state_kept_when_recompiled(self):
+
+        class Dummy(object):
+            def method(self, a):
+                return a
+
+        calls = []
+
+        def advice(aspect, name, obj, a):
+            calls.append(a)
+
+        pointcut = Pointcut(Dummy.method)
+        pointcut.add_advice(_Advice('before', pointcut, 'all', advice,
+                                    Every(3)))
+        dummy = Dummy()
+        for i in range(4):
+            dummy.method(i)
+            # Rebuilds the chains
+            Pointcut(Dummy.method)
+        self.assertEqual([0, 3], calls)
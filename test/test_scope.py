@@ -0,0 +1,136 @@
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import threading
+import unittest
+
+from easyaspect import Aspect, before, around, reset
+from easyaspect.scope import Scope
+
+
+class ScopedClass(object):
+    def method(self, a):
+        return a
+
+
+class TestScope(unittest.TestCase):
+    def test_activate(self):
+        scope = Scope()
+        self.assertFalse(scope.active)
+        with scope.activate():
+            self.assertTrue(scope.active)
+            with scope.activate():
+                self.assertTrue(scope.active)
+            self.assertTrue(scope.active)
+        self.assertFalse(scope.active)
+
+    def test_activation_per_thread(self):
+        scope = Scope()
+        seen = []
+        thread = threading.Thread(target=lambda: seen.append(scope.active))
+        with scope.activate():
+            thread.start()
+            thread.join()
+        self.assertEqual([False], seen)
+
+    def test_dispatch(self):
+        scope = Scope()
+        dispatch = scope.dispatch(lambda a: ('active', a),
+                                  lambda a: ('inactive', a))
+        self.assertEqual(('inactive', 1), dispatch(1))
+        with scope.activate():
+            self.assertEqual(('active', 2), dispatch(2))
+
+    def test_gate(self):
+        scope = Scope()
+        calls = []
+        gate = scope.gate(calls.append)
+        gate(1)
+        with scope.activate():
+            gate(2)
+        self.assertEqual([2], calls)
+
+    def test_around_gate(self):
+        scope = Scope()
+
+        def advice(aspect, name, next_, value):
+            return next_(value) * 10
+
+        gate = scope.gate(advice, around=True)
+        self.assertEqual(1, gate('aspect', 'name', lambda a: a, 1))
+        with scope.activate():
+            self.assertEqual(10, gate('aspect', 'name', lambda a: a, 1))
+
+
+class TestScopedAspect(unittest.TestCase):
+    def tearDown(self):
+        reset('ScopedClass.method')
+
+    def test_active(self):
+        calls = []
+
+        class DummyAspect(Aspect):
+            scoped = True
+
+            @before('ScopedClass.method')
+            def advice_func(cls, joinpoint, obj, a):
+                calls.append(a)
+
+        ScopedClass().method(1)
+        with DummyAspect.active():
+            ScopedClass().method(2)
+        ScopedClass().method(3)
+        self.assertEqual([2], calls)
+
+    def test_unscoped_aspect_always_runs(self):
+        calls = []
+
+        class ScopedAspect(Aspect):
+            scoped = True
+
+            @before('ScopedClass.method')
+            def advice_func(cls, joinpoint, obj, a):
+                calls.append(('scoped', a))
+
+        class UnscopedAspect(Aspect):
+            @before('ScopedClass.method')
+            def advice_func(cls, joinpoint, obj, a):
+                calls.append(('unscoped', a))
+
+        ScopedClass().method(1)
+        with ScopedAspect.active():
+            ScopedClass().method(2)
+        self.assertEqual(
+            [('unscoped', 1), ('scoped', 2), ('unscoped', 2)], calls)
+
+    def test_several_scopes(self):
+        calls = []
+
+        class FirstAspect(Aspect):
+            scoped = True
+
+            @before('ScopedClass.method')
+            def advice_func(cls, joinpoint, obj, a):
+                calls.append(('first', a))
+
+        class SecondAspect(Aspect):
+            scoped = True
+
+            @around('ScopedClass.method')
+            def advice_func(cls, joinpoint, next_, obj, a):
+                calls.append(('second', a))
+                return next_(obj, a)
+
+        with FirstAspect.active():
+            self.assertEqual(1, ScopedClass().method(1))
+        with SecondAspect.active():
+            self.assertEqual(2, ScopedClass().method(2))
+        self.assertEqual([('first', 1), ('second', 2)], calls)
+
+    def test_not_scoped(self):
+
+        class DummyAspect(Aspect):
+            pass
+
+        self.assertRaises(ValueError, DummyAspect.active)
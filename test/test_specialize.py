@@ -0,0 +1,94 @@
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import unittest
+from inspect import getargspec
+
+from easyaspect.advice import _Advice
+from easyaspect.pointcut import Pointcut, get_original
+from easyaspect.specialize import get_signature
+
+
+class TestSignature(unittest.TestCase):
+    def test_unsupported_signature(self):
+
+        def func(a, _ea_b):
+            pass
+
+        self.assertEqual(None, get_signature(func))
+        self.assertEqual(None, get_signature(len))
+
+    def test_make(self):
+
+        def func(a, b=2, *args, **kwargs):
+            pass
+
+        signature = get_signature(func)
+        around = signature.make('around', {
+            '_ea_advice': lambda *args, **kwargs: (args, kwargs),
+            '_ea_aspect': 'aspect', '_ea_name': 'func', '_ea_next': 'next'})
+        self.assertEqual(getargspec(func), getargspec(around))
+        self.assertEqual((('aspect', 'func', 'next', 1, 2, 3), {'c': 4}),
+                         around(1, 2, 3, c=4))
+
+
+class TestSpecializedWrapper(unittest.TestCase):
+    def setUp(self):
+        self.calls = []
+
+        class Dummy(object):
+            def method(self, a, b, c=3):
+                """Docstring."""
+                return a + b + c
+
+        self.Dummy = Dummy
+        self.pointcut = Pointcut(Dummy.method, specialize=True)
+        self.pointcut.aspect = 'aspect'
+
+    def add_advice(self, type):
+        calls = self.calls
+
+        def before(aspect, joinpoint, obj, *args, **kwargs):
+            calls.append((type, args, kwargs))
+
+        def around(aspect, joinpoint, next_, obj, *args, **kwargs):
+            calls.append((type, args, kwargs))
+            return next_(obj, *args, **kwargs)
+
+        func = around if type == 'around' else before
+        self.pointcut.add_advice(_Advice(type, self.pointcut, 'all', func))
+
+    def test_keep_function_attributes(self):
+        method = self.Dummy.method
+        orig = get_original(method)
+        self.assertNotEqual(orig, method.im_func)
+        self.assertEqual('method', method.__name__)
+        self.assertEqual('Docstring.', method.__doc__)
+        self.assertEqual(getargspec(orig), getargspec(method))
+
+    def test_run_advices(self):
+        self.add_advice('before')
+        self.add_advice('after')
+        self.add_advice('around')
+        self.assertEqual(6, self.Dummy().method(1, 2))
+        self.assertEqual(10, self.Dummy().method(1, c=7, b=2))
+        self.assertEqual([('around', (1, 2, 3), {}),
+                          ('before', (1, 2, 3), {}),
+                          ('after', (1, 2, 3), {}),
+                          ('around', (1, 2, 7), {}),
+                          ('before', (1, 2, 7), {}),
+                          ('after', (1, 2, 7), {})], self.calls)
+
+    def test_inherited_method(self):
+
+        class Child(self.Dummy):
+            pass
+
+        Pointcut(Child.method, specialize=True)
+        self.add_advice('before')
+        self.assertTrue(Child.method._joinpoint.inherited)
+        self.assertEqual(getargspec(get_original(Child.method)),
+                         getargspec(Child.method))
+        self.assertEqual(6, Child().method(1, 2))
+        self.assertEqual([('before', (1, 2, 3), {})], self.calls)
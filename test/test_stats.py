@@ -0,0 +1,67 @@
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import threading
+import unittest
+
+from easyaspect.stats import (ADVICES, CALLS, FUNCTION, Stats, combine,
+                              merge)
+
+
+class TestStats(unittest.TestCase):
+    def test_snapshot(self):
+        stats = Stats()
+        stats.record(('method', CALLS, None), 2)
+        stats.record(('method', CALLS, None), 3)
+        stats.record(('method', FUNCTION, None), 1)
+        stats.record(('method', ADVICES, 'advice'), 1)
+        self.assertEqual({'method': {
+            'calls': {'count': 2, 'total': 5, 'max': 3},
+            'function': {'count': 1, 'total': 1, 'max': 1},
+            'advices': {'advice': {'count': 1, 'total': 1, 'max': 1}}}},
+            stats.snapshot())
+
+    def test_merge_threads(self):
+        stats = Stats()
+        threads = [threading.Thread(target=stats.record,
+                                    args=(('method', CALLS, None), i))
+                   for i in range(1, 5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(4, len(stats._counters))
+        self.assertEqual({'method': {
+            'calls': {'count': 4, 'total': 10, 'max': 4}}},
+            stats.snapshot())
+
+    def test_timed(self):
+        stats = Stats()
+        timed = stats.timed(lambda a: a, ('method', FUNCTION, None))
+        self.assertEqual(42, timed(42))
+        self.assertEqual(1, stats.snapshot()['method']['function']['count'])
+
+    def test_merge(self):
+        a = {'method': {'calls': {'count': 1, 'total': 1, 'max': 1},
+                        'advices': {'x': {'count': 1, 'total': 2, 'max': 2}}}}
+        b = {'method': {'calls': {'count': 2, 'total': 3, 'max': 2}},
+             'other': {'calls': {'count': 1, 'total': 1, 'max': 1}}}
+        self.assertEqual({
+            'method': {'calls': {'count': 3, 'total': 4, 'max': 2},
+                       'advices': {'x': {'count': 1, 'total': 2, 'max': 2}}},
+            'other': {'calls': {'count': 1, 'total': 1, 'max': 1}}},
+            merge(a, b))
+
+    def test_combine(self):
+        a = {'method': {'calls': {'count': 2, 'total': 3, 'max': 2},
+                        'advices': {'x': {'count': 2, 'total': 2, 'max': 1}}}}
+        b = {'method': {'calls': {'count': 2, 'total': 4, 'max': 3},
+                        'advices': {'y': {'count': 2, 'total': 1, 'max': 1}}},
+             'other': {'calls': {'count': 1, 'total': 1, 'max': 1}}}
+        self.assertEqual({
+            'method': {'calls': {'count': 2, 'total': 3, 'max': 2},
+                       'advices': {'x': {'count': 2, 'total': 2, 'max': 1},
+                                   'y': {'count': 2, 'total': 1, 'max': 1}}},
+            'other': {'calls': {'count': 1, 'total': 1, 'max': 1}}},
+            combine(a, b))
@@ -2,14 +2,19 @@ import os
 import sys
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
 
+import imp
+import threading
+import types
 import unittest
 try:
     from unittest import mock
 except ImportError:
     import mock
 
+from easyaspect import utils
 from easyaspect.utils import (get_module, get_classes, get_methods,
-                              get_properties)
+                              get_properties, compile_pattern, filter_names,
+                              weaving, import_lock, register)
 
 
 class DummyClass(object):
@@ -69,6 +74,43 @@ class TestClasses(unittest.TestCase):
         self.assertEqual([], get_classes(module, 'Dmmy*'))
 
 
+def create_module(name, class_name):
+    module = types.ModuleType(name)
+    setattr(module, class_name, type(class_name, (object,), {}))
+    return module
+
+
+@mock.patch.dict('easyaspect.utils._registry', clear=True)
+class TestRegistry(unittest.TestCase):
+    def test_with_registered_classname_string(self):
+        module = create_module('registered_module', 'RegisteredClass')
+        register(module)
+        self.assertEqual([module.RegisteredClass],
+                         get_classes('RegisteredClass'))
+        self.assertEqual([module.RegisteredClass],
+                         get_classes('Registered*'))
+
+    def test_module_classes_first(self):
+        register(create_module('registered_module', 'DummyClass'))
+        self.assertEqual([DummyClass], get_classes('DummyClass'))
+
+    def test_ambiguous_classname(self):
+        register(create_module('module_a', 'RegisteredClass'),
+                 create_module('module_b', 'RegisteredClass'))
+        self.assertRaises(ValueError, get_classes, 'RegisteredClass')
+        self.assertRaises(ValueError, get_classes, 'Registered*')
+
+    def test_register_twice(self):
+        module = create_module('registered_module', 'RegisteredClass')
+        register(module)
+        register(module)
+        self.assertEqual([module.RegisteredClass],
+                         get_classes('RegisteredClass'))
+
+    def test_not_registered(self):
+        self.assertEqual([], get_classes('RegisteredClass'))
+
+
 class TestMethods(unittest.TestCase):
     def test_get_methods_from_class(self):
         methods = [(DummyClass, [
@@ -108,6 +150,13 @@ class TestMethods(unittest.TestCase):
         ])]
         self.assertEqual(methods, get_methods(DummyClass.method_a))
 
+    def test_get_all_methods_from_class(self):
+        methods = [(DummyClass, [
+            ('method_a', DummyClass.method_a),
+            ('method_b', DummyClass.method_b)
+        ])]
+        self.assertEqual(methods, get_methods(DummyClass))
+
 
 class TestProperties(unittest.TestCase):
     def test_get_properties_from_class(self):
@@ -143,3 +192,73 @@ class TestProperties(unittest.TestCase):
 
     def test_get_properties_with_wrong_type(self):
         self.assertEqual([], get_properties(0))
+
+
+class TestPatterns(unittest.TestCase):
+    def test_compile_pattern(self):
+        match = compile_pattern('method_*')
+        self.assertTrue(match('method_a'))
+        self.assertFalse(match('prop_a'))
+        self.assertTrue(match is compile_pattern('method_*'))
+
+    def test_compile_literal_pattern(self):
+        match = compile_pattern('method_a')
+        self.assertTrue(match('method_a'))
+        self.assertFalse(match('method_b'))
+
+    def test_filter_names(self):
+        self.assertEqual(['method_a', 'method_b'],
+                         filter_names(DummyClass, 'method_?'))
+        self.assertEqual(['prop_a'], filter_names(DummyClass, 'prop_a'))
+        self.assertEqual([], filter_names(DummyClass, 'prop_c'))
+        self.assertEqual(['DummyClass'], filter_names(globals(), 'Dummy*'))
+
+    def test_members_listed_once_per_weaving_pass(self):
+        with mock.patch('easyaspect.utils.dir', create=True,
+                        side_effect=dir) as mocked_dir:
+            with weaving():
+                get_methods(DummyClass, 'method_*')
+                with weaving():
+                    get_properties(DummyClass, 'prop_*')
+                self.assertEqual(1, mocked_dir.call_count)
+            self.assertEqual({}, utils._index)
+            get_methods(DummyClass, 'method_*')
+            self.assertEqual(2, mocked_dir.call_count)
+
+    def test_weaving_doesnt_hold_import_lock(self):
+        with weaving():
+            self.assertFalse(imp.lock_held())
+            with import_lock():
+                self.assertTrue(imp.lock_held())
+            self.assertFalse(imp.lock_held())
+
+    def test_import_lock_taken_before_weaving_lock(self):
+        weaving_started = threading.Event()
+        importing = threading.Event()
+        errors = []
+
+        def weave():
+            try:
+                with weaving():
+                    weaving_started.set()
+                    importing.wait(5)
+                    # Waits for the import lock without blocking the import
+                    with import_lock():
+                        pass
+            except Exception as e:
+                errors.append(e)
+
+        thread = threading.Thread(target=weave)
+        thread.start()
+        weaving_started.wait(5)
+        imp.acquire_lock()
+        try:
+            importing.set()
+            # Like a module being imported that weaves
+            with weaving():
+                pass
+        finally:
+            imp.release_lock()
+        thread.join(5)
+        self.assertFalse(thread.is_alive())
+        self.assertEqual([], errors)